@@ -1,69 +1,467 @@
-import asyncio
 import logging
-from typing import Dict, List, Any
-import json
-from datetime import datetime
+import numpy as np
+from numba import njit, prange
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+def _freeze(mapping: Dict[str, Any]) -> Mapping[str, Any]:
+    """Recursively wrap a nested dict in read-only mapping proxies"""
+    return MappingProxyType({
+        key: _freeze(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+# Shared empty fallback for missing nested results; never mutated
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Static lookup tables, built once at import time and shared by all agents
+_COACHING_CATEGORIES = _freeze({
+    "presentation_style": "Presentation Delivery & Style",
+    "emotional_intelligence": "Emotional Intelligence & Rapport",
+    "communication": "Communication Effectiveness",
+    "persuasion": "Persuasion & Influence",
+    "confidence": "Confidence & Authority",
+    "engagement": "Audience Engagement"
+})
+
+# Coaching frameworks and best practices
+_COACHING_FRAMEWORKS = _freeze({
+    "emotion_coaching": {
+        "positive_emotions": {
+            "happy": "Maintain this positive energy throughout your presentation",
+            "surprise": "Good use of surprise elements to maintain interest",
+            "neutral": "Consider adding more emotional variety to engage your audience"
+        },
+        "negative_emotions": {
+            "fear": "Work on building confidence through practice and preparation",
+            "angry": "Channel this energy into passion for your product/service",
+            "sad": "Focus on the positive outcomes and benefits for your audience"
+        }
+    },
+    "speech_coaching": {
+        "pacing": {
+            "too_fast": "Slow down to ensure your message is clearly understood",
+            "too_slow": "Increase your pace to maintain engagement",
+            "optimal": "Excellent pacing - maintain this rhythm"
+        },
+        "volume": {
+            "too_quiet": "Speak with more volume to project confidence",
+            "too_loud": "Moderate your volume for better audience comfort",
+            "good": "Great volume control"
+        }
+    },
+    "content_coaching": {
+        "persuasion": {
+            "low": "Include more benefit statements and social proof",
+            "medium": "Good persuasive elements, consider adding urgency",
+            "high": "Excellent persuasive language"
+        },
+        "clarity": {
+            "low": "Simplify your language and use shorter sentences",
+            "medium": "Good clarity, ensure key points are emphasized",
+            "high": "Excellent clarity and structure"
+        }
+    }
+})
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    """A single coaching recommendation"""
+    category: str
+    priority: str  # high, medium, low
+    title: str
+    description: str
+    actionable_steps: Tuple[str, ...]
+    examples: Tuple[str, ...]
+
+# Recommendation templates keyed by a short ID. Generators only record which
+# templates fired (plus any values to interpolate) and the final list is
+# rendered once, so the template data itself is shared by every request.
+_TEMPLATES: Dict[str, Recommendation] = {
+    "EMOTION_LOW_CONFIDENCE": Recommendation(
+        category="emotional_intelligence",
+        priority="high",
+        title="Build Emotional Confidence",
+        description="Your predominant emotion ({dominant_emotion}) suggests room for confidence building. Practice positive visualization before presentations.",
+        actionable_steps=(
+            "Practice power poses before presenting",
+            "Use positive self-talk and affirmations",
+            "Focus on the value you're providing to your audience",
+            "Record yourself practicing to build familiarity"
+        ),
+        examples=(
+            "Stand with feet shoulder-width apart, hands on hips for 2 minutes before presenting",
+            "Remind yourself: 'I have valuable insights to share'",
+            "Think about how your solution will help the client succeed"
+        )
+    ),
+    "EMOTION_LOW_ENGAGEMENT": Recommendation(
+        category="engagement",
+        priority="medium",
+        title="Increase Emotional Engagement",
+        description="Your emotional expression could be more engaging. Consider using more animated facial expressions and gestures.",
+        actionable_steps=(
+            "Practice varying your facial expressions",
+            "Use hand gestures to emphasize key points",
+            "Make more frequent eye contact with your audience",
+            "Smile genuinely when discussing positive outcomes"
+        ),
+        examples=(
+            "Raise eyebrows when sharing surprising statistics",
+            "Use open palm gestures when explaining benefits",
+            "Nod enthusiastically when discussing client success stories"
+        )
+    ),
+    "EMOTION_UNSTABLE": Recommendation(
+        category="presentation_style",
+        priority="medium",
+        title="Improve Emotional Consistency",
+        description="Your emotions varied significantly throughout the presentation. Work on maintaining consistent positive energy.",
+        actionable_steps=(
+            "Prepare emotional cues for different sections",
+            "Practice maintaining enthusiasm throughout",
+            "Use transitional phrases to maintain energy",
+            "Take brief pauses to reset your emotional state"
+        ),
+        examples=(
+            "Start each section with renewed enthusiasm",
+            "Use phrases like 'What's really exciting is...'",
+            "Pause and take a breath before key points"
+        )
+    ),
+    "SPEECH_TOO_SLOW": Recommendation(
+        category="presentation_style",
+        priority="medium",
+        title="Increase Speaking Pace",
+        description="Your speaking rate of {speaking_rate:.0f} words per minute is below optimal. Consider speaking slightly faster to maintain engagement.",
+        actionable_steps=(
+            "Practice with a metronome or timer",
+            "Reduce unnecessary pauses between words",
+            "Prepare and rehearse your content thoroughly",
+            "Focus on smooth transitions between ideas"
+        ),
+        examples=(
+            "Aim for 130-140 words per minute",
+            "Practice reading aloud with energy",
+            "Record yourself and compare to professional speakers"
+        )
+    ),
+    "SPEECH_TOO_FAST": Recommendation(
+        category="presentation_style",
+        priority="high",
+        title="Slow Down for Clarity",
+        description="Your speaking rate of {speaking_rate:.0f} words per minute may be too fast. Slow down to ensure comprehension.",
+        actionable_steps=(
+            "Practice deliberate pacing",
+            "Add strategic pauses for emphasis",
+            "Focus on clear articulation",
+            "Allow time for key points to sink in"
+        ),
+        examples=(
+            "Pause for 2-3 seconds after important statistics",
+            "Slow down when explaining complex concepts",
+            "Use the phrase 'Let me emphasize this point...'"
+        )
+    ),
+    "SPEECH_FILLER_WORDS": Recommendation(
+        category="communication",
+        priority="medium",
+        title="Reduce Filler Words",
+        description="You used {total_fillers} filler words. Reducing these will make you sound more confident and professional.",
+        actionable_steps=(
+            "Practice pausing instead of using fillers",
+            "Slow down your speech to think ahead",
+            "Prepare and rehearse key transitions",
+            "Record yourself to identify filler patterns"
+        ),
+        examples=(
+            "Instead of 'um', pause silently for 1-2 seconds",
+            "Replace 'you know' with 'as you can see'",
+            "Use 'let me explain' instead of 'basically'"
+        )
+    ),
+    "SPEECH_LOW_CONFIDENCE": Recommendation(
+        category="confidence",
+        priority="high",
+        title="Project More Vocal Confidence",
+        description="Your vocal delivery could project more confidence. Focus on volume, pace, and definitiveness.",
+        actionable_steps=(
+            "Speak with consistent volume",
+            "Use definitive language",
+            "Avoid uptalk (rising intonation on statements)",
+            "Practice breathing exercises for voice control"
+        ),
+        examples=(
+            "Say 'This will increase efficiency' instead of 'This might help'",
+            "End statements with falling intonation",
+            "Breathe from your diaphragm for stronger voice projection"
+        )
+    ),
+    "TEXT_LOW_PERSUASION": Recommendation(
+        category="persuasion",
+        priority="high",
+        title="Strengthen Persuasive Language",
+        description="Your message could be more persuasive. Include more benefit statements and calls to action.",
+        actionable_steps=(
+            "Highlight specific benefits for the client",
+            "Include quantifiable results and ROI",
+            "Add social proof and testimonials",
+            "End with clear next steps"
+        ),
+        examples=(
+            "'Companies like yours have seen 40% efficiency gains'",
+            "'This investment will pay for itself in 6 months'",
+            "'Shall we schedule a pilot program next week?'"
+        )
+    ),
+    "TEXT_LOW_PROFESSIONALISM": Recommendation(
+        category="communication",
+        priority="medium",
+        title="Enhance Professional Language",
+        description="Consider using more professional vocabulary and reducing casual expressions.",
+        actionable_steps=(
+            "Replace casual words with professional alternatives",
+            "Use industry-specific terminology appropriately",
+            "Structure sentences more formally",
+            "Avoid colloquialisms and slang"
+        ),
+        examples=(
+            "Say 'solution' instead of 'thing'",
+            "Use 'implement' instead of 'do'",
+            "Replace 'awesome' with 'excellent' or 'outstanding'"
+        )
+    ),
+    "TEXT_LOW_CLARITY": Recommendation(
+        category="communication",
+        priority="high",
+        title="Improve Message Clarity",
+        description="Your message could be clearer and easier to understand. Simplify complex sentences and concepts.",
+        actionable_steps=(
+            "Use shorter, simpler sentences",
+            "Break complex ideas into steps",
+            "Define technical terms",
+            "Use analogies and examples"
+        ),
+        examples=(
+            "Instead of long sentences, use bullet points",
+            "'Think of it like...' for analogies",
+            "'In simple terms, this means...'"
+        )
+    ),
+    "TEXT_NEGATIVE_SENTIMENT": Recommendation(
+        category="communication",
+        priority="high",
+        title="Improve Positive Messaging",
+        description="Your language contains more negative than positive elements. Reframe challenges as opportunities.",
+        actionable_steps=(
+            "Focus on solutions rather than problems",
+            "Use positive language to describe outcomes",
+            "Reframe challenges as opportunities for improvement",
+            "Emphasize benefits and value propositions"
+        ),
+        examples=(
+            "'This addresses your efficiency challenges' becomes 'This boosts your efficiency'",
+            "'Problems' become 'opportunities for improvement'",
+            "Focus on 'what you'll gain' not 'what you're missing'"
+        )
+    ),
+    "HOLISTIC_LOW_CONFIDENCE": Recommendation(
+        category="confidence",
+        priority="high",
+        title="Build Overall Presentation Confidence",
+        description="Multiple indicators suggest room for confidence improvement across your entire presentation approach.",
+        actionable_steps=(
+            "Practice your presentation multiple times",
+            "Prepare for common questions and objections",
+            "Visualize successful outcomes",
+            "Start with smaller, lower-stakes presentations"
+        ),
+        examples=(
+            "Practice in front of colleagues for feedback",
+            "Prepare 3-5 success stories you can share",
+            "Imagine the client saying 'yes' at the end"
+        )
+    ),
+    "HOLISTIC_ENERGY_MISMATCH": Recommendation(
+        category="engagement",
+        priority="medium",
+        title="Align Emotional and Vocal Energy",
+        description="Your vocal delivery is strong, but your emotional expression could match that energy level.",
+        actionable_steps=(
+            "Match facial expressions to your vocal enthusiasm",
+            "Use gestures that complement your confident voice",
+            "Practice in front of a mirror",
+            "Record yourself to observe alignment"
+        ),
+        examples=(
+            "Smile when your voice conveys excitement",
+            "Use open gestures when speaking confidently",
+            "Make eye contact when making strong statements"
+        )
+    )
+}
+
+# Fallback returned when recommendation generation fails
+_DEFAULT_RECOMMENDATIONS: Tuple[Recommendation, ...] = (
+    Recommendation(
+        category="general",
+        priority="medium",
+        title="Practice and Prepare",
+        description="Regular practice is the foundation of great presentations. Rehearse your content and anticipate questions.",
+        actionable_steps=(
+            "Practice your presentation multiple times",
+            "Prepare for common questions",
+            "Time your presentation sections",
+            "Get feedback from colleagues"
+        ),
+        examples=(
+            "Rehearse in front of a mirror",
+            "Record yourself and review",
+            "Practice with different audience scenarios"
+        )
+    ),
+)
+
+# Priority bucket (high, medium, low) of every template, resolved once at
+# import time so ranking is a bucket append rather than a sort
+_PRIORITY_BUCKET = {"high": 0, "medium": 1, "low": 2}
+_TEMPLATE_BUCKET = {
+    template_id: _PRIORITY_BUCKET[template.priority]
+    for template_id, template in _TEMPLATES.items()
+}
+
+# Rule tables mapping a predicate over the extracted scores to the template it
+# triggers. Rules are evaluated in order, which is also the emission order.
+# The batch path evaluates the same rules in the compiled _eval_rules kernel.
+_EMOTION_RULES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("EMOTION_LOW_CONFIDENCE", lambda c: c["negative_emotion"]),
+    ("EMOTION_LOW_ENGAGEMENT", lambda c: c["engagement_level"] < 0.5),
+    ("EMOTION_UNSTABLE", lambda c: c["emotion_stability"] < 0.7),
+)
+
+_SPEECH_RULES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("SPEECH_TOO_SLOW", lambda c: (c["speaking_rate"] > 0) & (c["speaking_rate"] < 120)),
+    ("SPEECH_TOO_FAST", lambda c: c["speaking_rate"] > 150),
+    ("SPEECH_FILLER_WORDS", lambda c: c["total_fillers"] > 3),
+    ("SPEECH_LOW_CONFIDENCE", lambda c: c["confidence_score"] < 0.7),
+)
+
+_TEXT_RULES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("TEXT_LOW_PERSUASION", lambda c: c["persuasiveness_score"] < 0.6),
+    ("TEXT_LOW_PROFESSIONALISM", lambda c: c["professionalism_score"] < 0.7),
+    ("TEXT_LOW_CLARITY", lambda c: c["clarity_score"] < 0.6),
+    ("TEXT_NEGATIVE_SENTIMENT", lambda c: c["negative_sentiment"]),
+)
+
+_HOLISTIC_RULES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("HOLISTIC_LOW_CONFIDENCE", lambda c: c["overall_confidence"] < 0.6),
+    ("HOLISTIC_ENERGY_MISMATCH", lambda c: (c["emotion_confidence"] < 0.6) & (c["speech_confidence"] > 0.7)),
+)
+
+# Rule tables paired with the context flag that gates them. Per-modality rules
+# only apply when that modality produced results; holistic rules always apply.
+_RULE_SECTIONS: Tuple[Tuple[Optional[str], Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...]], ...] = (
+    ("has_emotions", _EMOTION_RULES),
+    ("has_speech", _SPEECH_RULES),
+    ("has_text", _TEXT_RULES),
+    (None, _HOLISTIC_RULES),
+)
+
+# Context fields read by the rule predicates, in the column order of the
+# batch kernel's feature matrix
+_RULE_INPUTS: Tuple[str, ...] = (
+    "has_emotions",
+    "has_speech",
+    "has_text",
+    "negative_emotion",
+    "engagement_level",
+    "emotion_stability",
+    "speaking_rate",
+    "total_fillers",
+    "confidence_score",
+    "persuasiveness_score",
+    "professionalism_score",
+    "clarity_score",
+    "negative_sentiment",
+    "emotion_confidence",
+    "speech_confidence",
+    "overall_confidence",
+)
+
+def _rule_key(context: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Exact tuple of the rule inputs, used as the evaluation cache key"""
+    # Values are not rounded: a quantized key would move scores across the thresholds
+    return tuple(context[name] for name in _RULE_INPUTS)
+
+@lru_cache(maxsize=4096)
+def _triggered_template_ids(rule_key: Tuple[Any, ...]) -> Tuple[str, ...]:
+    """Template IDs of every rule that fires for the given rule inputs"""
+    context = dict(zip(_RULE_INPUTS, rule_key))
+    return tuple(
+        template_id
+        for section, rules in _RULE_SECTIONS
+        if section is None or context[section]
+        for template_id, predicate in rules
+        if predicate(context)
+    )
+
+# Template IDs in rule-table order; column j of the batch kernel output is
+# rule j. The numeric inputs (booleans as 0/1) are laid out in _RULE_INPUTS
+# order, so _eval_rules must be kept in step with both tables.
+_RULE_TEMPLATE_IDS: Tuple[str, ...] = tuple(
+    template_id for _, rules in _RULE_SECTIONS for template_id, _ in rules
+)
+_N_RULES = len(_RULE_TEMPLATE_IDS)
+
+# The explicit signature compiles the kernel eagerly at import time (and with
+# cache=True, from the on-disk cache afterwards) instead of on the first batch
+@njit("uint8[:, :](float64[:, :])", cache=True, parallel=True)
+def _eval_rules(features):
+    """Evaluate every rule for each session row, returning a (sessions, rules) 0/1 matrix"""
+    n = features.shape[0]
+    out = np.zeros((n, _N_RULES), np.uint8)
+    for i in prange(n):
+        has_emotions = features[i, 0] != 0
+        has_speech = features[i, 1] != 0
+        has_text = features[i, 2] != 0
+        speaking_rate = features[i, 6]
+        
+        # Emotion rules
+        out[i, 0] = has_emotions and features[i, 3] != 0
+        out[i, 1] = has_emotions and features[i, 4] < 0.5
+        out[i, 2] = has_emotions and features[i, 5] < 0.7
+        
+        # Speech rules
+        out[i, 3] = has_speech and speaking_rate > 0 and speaking_rate < 120
+        out[i, 4] = has_speech and speaking_rate > 150
+        out[i, 5] = has_speech and features[i, 7] > 3
+        out[i, 6] = has_speech and features[i, 8] < 0.7
+        
+        # Text rules
+        out[i, 7] = has_text and features[i, 9] < 0.6
+        out[i, 8] = has_text and features[i, 10] < 0.7
+        out[i, 9] = has_text and features[i, 11] < 0.6
+        out[i, 10] = has_text and features[i, 12] != 0
+        
+        # Holistic rules
+        out[i, 11] = features[i, 15] < 0.6
+        out[i, 12] = features[i, 13] < 0.6 and features[i, 14] > 0.7
+    return out
+
 class CoachingAgent:
     """AI agent for generating personalized sales coaching recommendations"""
     
     def __init__(self):
-        self.coaching_categories = {
-            "presentation_style": "Presentation Delivery & Style",
-            "emotional_intelligence": "Emotional Intelligence & Rapport",
-            "communication": "Communication Effectiveness",
-            "persuasion": "Persuasion & Influence",
-            "confidence": "Confidence & Authority",
-            "engagement": "Audience Engagement"
-        }
+        self.coaching_categories = _COACHING_CATEGORIES
         
         # Coaching frameworks and best practices
-        self.coaching_frameworks = self._initialize_coaching_frameworks()
-    
-    def _initialize_coaching_frameworks(self) -> Dict[str, Any]:
-        """Initialize coaching frameworks and best practices"""
-        return {
-            "emotion_coaching": {
-                "positive_emotions": {
-                    "happy": "Maintain this positive energy throughout your presentation",
-                    "surprise": "Good use of surprise elements to maintain interest",
-                    "neutral": "Consider adding more emotional variety to engage your audience"
-                },
-                "negative_emotions": {
-                    "fear": "Work on building confidence through practice and preparation",
-                    "angry": "Channel this energy into passion for your product/service",
-                    "sad": "Focus on the positive outcomes and benefits for your audience"
-                }
-            },
-            "speech_coaching": {
-                "pacing": {
-                    "too_fast": "Slow down to ensure your message is clearly understood",
-                    "too_slow": "Increase your pace to maintain engagement",
-                    "optimal": "Excellent pacing - maintain this rhythm"
-                },
-                "volume": {
-                    "too_quiet": "Speak with more volume to project confidence",
-                    "too_loud": "Moderate your volume for better audience comfort",
-                    "good": "Great volume control"
-                }
-            },
-            "content_coaching": {
-                "persuasion": {
-                    "low": "Include more benefit statements and social proof",
-                    "medium": "Good persuasive elements, consider adding urgency",
-                    "high": "Excellent persuasive language"
-                },
-                "clarity": {
-                    "low": "Simplify your language and use shorter sentences",
-                    "medium": "Good clarity, ensure key points are emphasized",
-                    "high": "Excellent clarity and structure"
-                }
-            }
-        }
+        self.coaching_frameworks = _COACHING_FRAMEWORKS
     
-    async def generate_recommendations(self, analysis_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def generate_recommendations(self, analysis_data: Dict[str, Any]) -> List[Recommendation]:
         """
         Generate personalized coaching recommendations based on multimodal analysis
         
@@ -74,411 +472,197 @@ class CoachingAgent:
             List of coaching recommendations
         """
         try:
-            logger.info("Generating coaching recommendations")
+            logger.debug("Generating coaching recommendations")
             
-            # Run recommendation generation in thread pool
-            loop = asyncio.get_event_loop()
-            recommendations = await loop.run_in_executor(
-                None, 
-                self._generate_recommendations_sync, 
-                analysis_data
-            )
+            # Rule evaluation is cheap pure-Python work, so run it inline
+            # rather than paying for a thread pool round-trip
+            recommendations = self._generate_recommendations_sync(analysis_data)
             
             return recommendations
             
         except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
+            logger.error("Error generating recommendations: %s", e)
             return self._get_default_recommendations()
     
-    def _generate_recommendations_sync(self, analysis_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Synchronous recommendation generation"""
-        recommendations = []
-        
-        # Extract analysis components
-        emotions = analysis_data.get("emotions", {})
-        speech = analysis_data.get("speech", {})
-        text = analysis_data.get("text", {})
-        
-        # Generate emotion-based recommendations
-        emotion_recs = self._generate_emotion_recommendations(emotions)
-        recommendations.extend(emotion_recs)
-        
-        # Generate speech-based recommendations
-        speech_recs = self._generate_speech_recommendations(speech)
-        recommendations.extend(speech_recs)
-        
-        # Generate text-based recommendations
-        text_recs = self._generate_text_recommendations(text)
-        recommendations.extend(text_recs)
-        
-        # Generate holistic recommendations
-        holistic_recs = self._generate_holistic_recommendations(analysis_data)
-        recommendations.extend(holistic_recs)
-        
-        # Priority ranking and deduplication
-        recommendations = self._prioritize_and_deduplicate(recommendations)
+    async def generate_recommendations_batch(
+        self,
+        analysis_batch: List[Dict[str, Any]]
+    ) -> List[List[Recommendation]]:
+        """
+        Generate coaching recommendations for many sessions at once
         
-        # Limit to top 8 recommendations
-        return recommendations[:8]
+        Args:
+            analysis_batch: Combined analysis results, one entry per session
+            
+        Returns:
+            List of coaching recommendations for each session, in input order
+        """
+        try:
+            logger.debug("Generating coaching recommendations for %d sessions", len(analysis_batch))
+            
+            return self._generate_recommendations_batch_sync(analysis_batch)
+            
+        except Exception as e:
+            logger.error("Error generating batch recommendations: %s", e)
+            return [self._get_default_recommendations() for _ in analysis_batch]
     
-    def _generate_emotion_recommendations(self, emotions: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate recommendations based on emotion analysis"""
-        recommendations = []
-        
-        if not emotions:
-            return recommendations
-        
-        dominant_emotion = emotions.get("dominant_emotion", "neutral")
-        confidence = emotions.get("confidence", 0)
-        engagement_level = emotions.get("analysis_summary", {}).get("engagement_level", 0)
-        
-        # Emotion-specific recommendations
-        if dominant_emotion in ["fear", "sad"]:
-            recommendations.append({
-                "category": "emotional_intelligence",
-                "priority": "high",
-                "title": "Build Emotional Confidence",
-                "description": f"Your predominant emotion ({dominant_emotion}) suggests room for confidence building. Practice positive visualization before presentations.",
-                "actionable_steps": [
-                    "Practice power poses before presenting",
-                    "Use positive self-talk and affirmations",
-                    "Focus on the value you're providing to your audience",
-                    "Record yourself practicing to build familiarity"
-                ],
-                "examples": [
-                    "Stand with feet shoulder-width apart, hands on hips for 2 minutes before presenting",
-                    "Remind yourself: 'I have valuable insights to share'",
-                    "Think about how your solution will help the client succeed"
-                ]
-            })
+    def _generate_recommendations_sync(self, analysis_data: Dict[str, Any]) -> List[Recommendation]:
+        """Synchronous recommendation generation"""
+        if not analysis_data:
+            return self._get_default_recommendations()
         
-        if engagement_level < 0.5:
-            recommendations.append({
-                "category": "engagement",
-                "priority": "medium",
-                "title": "Increase Emotional Engagement",
-                "description": "Your emotional expression could be more engaging. Consider using more animated facial expressions and gestures.",
-                "actionable_steps": [
-                    "Practice varying your facial expressions",
-                    "Use hand gestures to emphasize key points",
-                    "Make more frequent eye contact with your audience",
-                    "Smile genuinely when discussing positive outcomes"
-                ],
-                "examples": [
-                    "Raise eyebrows when sharing surprising statistics",
-                    "Use open palm gestures when explaining benefits",
-                    "Nod enthusiastically when discussing client success stories"
-                ]
-            })
+        # Evaluate every rule against the extracted scores
+        triggered = self._evaluate(analysis_data)
         
-        # Stability recommendations
-        stability = emotions.get("analysis_summary", {}).get("emotion_stability", 1)
-        if stability < 0.7:
-            recommendations.append({
-                "category": "presentation_style",
-                "priority": "medium",
-                "title": "Improve Emotional Consistency",
-                "description": "Your emotions varied significantly throughout the presentation. Work on maintaining consistent positive energy.",
-                "actionable_steps": [
-                    "Prepare emotional cues for different sections",
-                    "Practice maintaining enthusiasm throughout",
-                    "Use transitional phrases to maintain energy",
-                    "Take brief pauses to reset your emotional state"
-                ],
-                "examples": [
-                    "Start each section with renewed enthusiasm",
-                    "Use phrases like 'What's really exciting is...'",
-                    "Pause and take a breath before key points"
-                ]
-            })
+        # Priority ranking and deduplication, limited to top 8 recommendations
+        triggered = self._prioritize_and_deduplicate(triggered)[:8]
         
-        return recommendations
+        # Render only the templates that made the cut
+        return [
+            self._render_recommendation(template_id, format_args)
+            for template_id, format_args in triggered
+        ]
     
-    def _generate_speech_recommendations(self, speech: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate recommendations based on speech analysis"""
-        recommendations = []
-        
-        if not speech:
-            return recommendations
-        
-        speaking_rate = speech.get("speaking_rate", 0)
-        filler_words = speech.get("filler_words", {})
-        delivery_metrics = speech.get("delivery_metrics", {})
-        
-        # Speaking rate recommendations
-        if speaking_rate > 0:
-            if speaking_rate < 120:
-                recommendations.append({
-                    "category": "presentation_style",
-                    "priority": "medium",
-                    "title": "Increase Speaking Pace",
-                    "description": f"Your speaking rate of {speaking_rate:.0f} words per minute is below optimal. Consider speaking slightly faster to maintain engagement.",
-                    "actionable_steps": [
-                        "Practice with a metronome or timer",
-                        "Reduce unnecessary pauses between words",
-                        "Prepare and rehearse your content thoroughly",
-                        "Focus on smooth transitions between ideas"
-                    ],
-                    "examples": [
-                        "Aim for 130-140 words per minute",
-                        "Practice reading aloud with energy",
-                        "Record yourself and compare to professional speakers"
-                    ]
-                })
-            elif speaking_rate > 150:
-                recommendations.append({
-                    "category": "presentation_style",
-                    "priority": "high",
-                    "title": "Slow Down for Clarity",
-                    "description": f"Your speaking rate of {speaking_rate:.0f} words per minute may be too fast. Slow down to ensure comprehension.",
-                    "actionable_steps": [
-                        "Practice deliberate pacing",
-                        "Add strategic pauses for emphasis",
-                        "Focus on clear articulation",
-                        "Allow time for key points to sink in"
-                    ],
-                    "examples": [
-                        "Pause for 2-3 seconds after important statistics",
-                        "Slow down when explaining complex concepts",
-                        "Use the phrase 'Let me emphasize this point...'"
-                    ]
-                })
-        
-        # Filler words recommendations
-        total_fillers = sum(filler_words.values()) if filler_words else 0
-        if total_fillers > 3:
-            recommendations.append({
-                "category": "communication",
-                "priority": "medium",
-                "title": "Reduce Filler Words",
-                "description": f"You used {total_fillers} filler words. Reducing these will make you sound more confident and professional.",
-                "actionable_steps": [
-                    "Practice pausing instead of using fillers",
-                    "Slow down your speech to think ahead",
-                    "Prepare and rehearse key transitions",
-                    "Record yourself to identify filler patterns"
-                ],
-                "examples": [
-                    "Instead of 'um', pause silently for 1-2 seconds",
-                    "Replace 'you know' with 'as you can see'",
-                    "Use 'let me explain' instead of 'basically'"
-                ]
-            })
-        
-        # Confidence recommendations based on delivery metrics
-        confidence_score = delivery_metrics.get("confidence_score", 0)
-        if confidence_score < 0.7:
-            recommendations.append({
-                "category": "confidence",
-                "priority": "high",
-                "title": "Project More Vocal Confidence",
-                "description": "Your vocal delivery could project more confidence. Focus on volume, pace, and definitiveness.",
-                "actionable_steps": [
-                    "Speak with consistent volume",
-                    "Use definitive language",
-                    "Avoid uptalk (rising intonation on statements)",
-                    "Practice breathing exercises for voice control"
-                ],
-                "examples": [
-                    "Say 'This will increase efficiency' instead of 'This might help'",
-                    "End statements with falling intonation",
-                    "Breathe from your diaphragm for stronger voice projection"
-                ]
-            })
-        
-        return recommendations
+    @staticmethod
+    def _render_recommendation(template_id: str, format_args: Dict[str, Any]) -> Recommendation:
+        """Build a recommendation from its template and interpolated values"""
+        template = _TEMPLATES[template_id]
+        return replace(template, description=template.description.format(**format_args))
     
-    def _generate_text_recommendations(self, text: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate recommendations based on text analysis"""
-        recommendations = []
-        
-        if not text:
-            return recommendations
-        
-        persuasiveness_score = text.get("persuasiveness_score", 0)
-        professionalism_score = text.get("professionalism_score", 0)
-        clarity_score = text.get("clarity_score", 0)
-        sentiment = text.get("sentiment", "neutral")
-        
-        # Persuasiveness recommendations
-        if persuasiveness_score < 0.6:
-            recommendations.append({
-                "category": "persuasion",
-                "priority": "high",
-                "title": "Strengthen Persuasive Language",
-                "description": "Your message could be more persuasive. Include more benefit statements and calls to action.",
-                "actionable_steps": [
-                    "Highlight specific benefits for the client",
-                    "Include quantifiable results and ROI",
-                    "Add social proof and testimonials",
-                    "End with clear next steps"
-                ],
-                "examples": [
-                    "'Companies like yours have seen 40% efficiency gains'",
-                    "'This investment will pay for itself in 6 months'",
-                    "'Shall we schedule a pilot program next week?'"
-                ]
-            })
-        
-        # Professionalism recommendations
-        if professionalism_score < 0.7:
-            recommendations.append({
-                "category": "communication",
-                "priority": "medium",
-                "title": "Enhance Professional Language",
-                "description": "Consider using more professional vocabulary and reducing casual expressions.",
-                "actionable_steps": [
-                    "Replace casual words with professional alternatives",
-                    "Use industry-specific terminology appropriately",
-                    "Structure sentences more formally",
-                    "Avoid colloquialisms and slang"
-                ],
-                "examples": [
-                    "Say 'solution' instead of 'thing'",
-                    "Use 'implement' instead of 'do'",
-                    "Replace 'awesome' with 'excellent' or 'outstanding'"
-                ]
-            })
+    def _generate_recommendations_batch_sync(
+        self,
+        analysis_batch: List[Dict[str, Any]]
+    ) -> List[List[Recommendation]]:
+        """Vectorised recommendation generation over a batch of sessions"""
+        results = [[] if analysis_data else self._get_default_recommendations() for analysis_data in analysis_batch]
+        
+        # Extract the scalar scores of every session that has any results
+        contexts = []
+        positions = []
+        for position, analysis_data in enumerate(analysis_batch):
+            context = self._build_context(analysis_data) if analysis_data else None
+            if context is not None:
+                contexts.append(context)
+                positions.append(position)
+        
+        if not contexts:
+            return results
+        
+        # Pack the rule inputs into a float matrix and evaluate every rule in
+        # one compiled pass
+        features = np.array(
+            [[float(context[name]) for name in _RULE_INPUTS] for context in contexts],
+            dtype=np.float64
+        )
+        fired = _eval_rules(features)
         
-        # Clarity recommendations
-        if clarity_score < 0.6:
-            recommendations.append({
-                "category": "communication",
-                "priority": "high",
-                "title": "Improve Message Clarity",
-                "description": "Your message could be clearer and easier to understand. Simplify complex sentences and concepts.",
-                "actionable_steps": [
-                    "Use shorter, simpler sentences",
-                    "Break complex ideas into steps",
-                    "Define technical terms",
-                    "Use analogies and examples"
-                ],
-                "examples": [
-                    "Instead of long sentences, use bullet points",
-                    "'Think of it like...' for analogies",
-                    "'In simple terms, this means...'"
-                ]
-            })
+        triggered = [
+            [(_RULE_TEMPLATE_IDS[rule], context) for rule in np.flatnonzero(row)]
+            for context, row in zip(contexts, fired)
+        ]
         
-        # Sentiment recommendations
-        if sentiment == "negative":
-            recommendations.append({
-                "category": "communication",
-                "priority": "high",
-                "title": "Improve Positive Messaging",
-                "description": "Your language contains more negative than positive elements. Reframe challenges as opportunities.",
-                "actionable_steps": [
-                    "Focus on solutions rather than problems",
-                    "Use positive language to describe outcomes",
-                    "Reframe challenges as opportunities for improvement",
-                    "Emphasize benefits and value propositions"
-                ],
-                "examples": [
-                    "'This addresses your efficiency challenges' becomes 'This boosts your efficiency'",
-                    "'Problems' become 'opportunities for improvement'",
-                    "Focus on 'what you'll gain' not 'what you're missing'"
-                ]
-            })
+        for position, session_triggered in zip(positions, triggered):
+            results[position] = [
+                self._render_recommendation(template_id, format_args)
+                for template_id, format_args in self._prioritize_and_deduplicate(session_triggered)[:8]
+            ]
         
-        return recommendations
+        return results
     
-    def _generate_holistic_recommendations(self, analysis_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate holistic recommendations based on combined analysis"""
-        recommendations = []
-        
-        # Check for consistent themes across modalities
-        emotions = analysis_data.get("emotions", {})
-        speech = analysis_data.get("speech", {})
-        text = analysis_data.get("text", {})
-        
-        # Low confidence across modalities
-        emotion_confidence = emotions.get("analysis_summary", {}).get("engagement_level", 1)
-        speech_confidence = speech.get("delivery_metrics", {}).get("confidence_score", 1)
-        text_persuasiveness = text.get("persuasiveness_score", 1)
-        
-        overall_confidence = (emotion_confidence + speech_confidence + text_persuasiveness) / 3
-        
-        if overall_confidence < 0.6:
-            recommendations.append({
-                "category": "confidence",
-                "priority": "high",
-                "title": "Build Overall Presentation Confidence",
-                "description": "Multiple indicators suggest room for confidence improvement across your entire presentation approach.",
-                "actionable_steps": [
-                    "Practice your presentation multiple times",
-                    "Prepare for common questions and objections",
-                    "Visualize successful outcomes",
-                    "Start with smaller, lower-stakes presentations"
-                ],
-                "examples": [
-                    "Practice in front of colleagues for feedback",
-                    "Prepare 3-5 success stories you can share",
-                    "Imagine the client saying 'yes' at the end"
-                ]
-            })
-        
-        # Engagement optimization
-        if emotion_confidence < 0.6 and speech_confidence > 0.7:
-            recommendations.append({
-                "category": "engagement",
-                "priority": "medium",
-                "title": "Align Emotional and Vocal Energy",
-                "description": "Your vocal delivery is strong, but your emotional expression could match that energy level.",
-                "actionable_steps": [
-                    "Match facial expressions to your vocal enthusiasm",
-                    "Use gestures that complement your confident voice",
-                    "Practice in front of a mirror",
-                    "Record yourself to observe alignment"
-                ],
-                "examples": [
-                    "Smile when your voice conveys excitement",
-                    "Use open gestures when speaking confidently",
-                    "Make eye contact when making strong statements"
-                ]
-            })
+    @staticmethod
+    def _evaluate(analysis_data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Evaluate all rule tables against the extracted scores"""
+        context = CoachingAgent._build_context(analysis_data)
+        
+        # No rule can fire without at least one modality
+        if context is None:
+            return []
+        
+        # Repeated sessions (e.g. re-analysed uploads) have identical scores,
+        # so the rule evaluation itself is memoized on the exact inputs
+        return [(template_id, context) for template_id in _triggered_template_ids(_rule_key(context))]
+    
+    @staticmethod
+    def _build_context(analysis_data: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract every score used by the rules once, or None if no modality is present"""
+        # `or _EMPTY` falls back to a shared read-only mapping, unlike
+        # `.get(key, {})` which builds a throwaway dict on every call
+        get = analysis_data.get
+        emotions = get("emotions") or _EMPTY
+        speech = get("speech") or _EMPTY
+        text = get("text") or _EMPTY
+        
+        if not (emotions or speech or text):
+            return None
+        
+        emotions_get = emotions.get
+        speech_get = speech.get
+        text_get = text.get
+        summary_get = (emotions_get("analysis_summary") or _EMPTY).get
+        
+        # Scores shared by the per-modality and holistic rules, which use
+        # different fallbacks when a score is missing
+        engagement_level = summary_get("engagement_level")
+        confidence_score = (speech_get("delivery_metrics") or _EMPTY).get("confidence_score")
+        persuasiveness_score = text_get("persuasiveness_score")
+        
+        emotion_confidence = 1 if engagement_level is None else engagement_level
+        speech_confidence = 1 if confidence_score is None else confidence_score
+        text_persuasiveness = 1 if persuasiveness_score is None else persuasiveness_score
+        
+        dominant_emotion = emotions_get("dominant_emotion", "neutral")
         
-        return recommendations
+        return {
+            "has_emotions": bool(emotions),
+            "has_speech": bool(speech),
+            "has_text": bool(text),
+            "dominant_emotion": dominant_emotion,
+            "negative_emotion": dominant_emotion in ("fear", "sad"),
+            "engagement_level": 0 if engagement_level is None else engagement_level,
+            "emotion_stability": summary_get("emotion_stability", 1),
+            "speaking_rate": speech_get("speaking_rate", 0),
+            "total_fillers": CoachingAgent._total_fillers(speech),
+            "confidence_score": 0 if confidence_score is None else confidence_score,
+            "persuasiveness_score": 0 if persuasiveness_score is None else persuasiveness_score,
+            "professionalism_score": text_get("professionalism_score", 0),
+            "clarity_score": text_get("clarity_score", 0),
+            "negative_sentiment": text_get("sentiment", "neutral") == "negative",
+            "emotion_confidence": emotion_confidence,
+            "speech_confidence": speech_confidence,
+            "overall_confidence": (emotion_confidence + speech_confidence + text_persuasiveness) / 3
+        }
+    
+    @staticmethod
+    def _total_fillers(speech: Mapping[str, Any]) -> int:
+        """Total filler word count, preferring the analyzer's precomputed total"""
+        filler_total = speech.get("filler_total")
+        if filler_total is not None:
+            return filler_total
+        
+        filler_words = speech.get("filler_words")
+        return sum(filler_words.values()) if filler_words else 0
     
-    def _prioritize_and_deduplicate(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _prioritize_and_deduplicate(
+        triggered: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
         """Prioritize and remove duplicate recommendations"""
-        # Priority order
-        priority_order = {"high": 3, "medium": 2, "low": 1}
-        
-        # Remove duplicates based on title
+        buckets = ([], [], [])
         seen_titles = set()
-        unique_recommendations = []
-        
-        for rec in recommendations:
-            if rec["title"] not in seen_titles:
-                seen_titles.add(rec["title"])
-                unique_recommendations.append(rec)
         
-        # Sort by priority
-        unique_recommendations.sort(
-            key=lambda x: priority_order.get(x["priority"], 0), 
-            reverse=True
-        )
-        
-        return unique_recommendations
+        # Remove duplicates based on title and place each recommendation in its
+        # priority bucket, preserving emission order within a bucket
+        for item in triggered:
+            template_id = item[0]
+            title = _TEMPLATES[template_id].title
+            if title not in seen_titles:
+                seen_titles.add(title)
+                buckets[_TEMPLATE_BUCKET[template_id]].append(item)
+        
+        high, medium, low = buckets
+        return high + medium + low
     
-    def _get_default_recommendations(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _get_default_recommendations() -> List[Recommendation]:
         """Return default recommendations when generation fails"""
-        return [
-            {
-                "category": "general",
-                "priority": "medium",
-                "title": "Practice and Prepare",
-                "description": "Regular practice is the foundation of great presentations. Rehearse your content and anticipate questions.",
-                "actionable_steps": [
-                    "Practice your presentation multiple times",
-                    "Prepare for common questions",
-                    "Time your presentation sections",
-                    "Get feedback from colleagues"
-                ],
-                "examples": [
-                    "Rehearse in front of a mirror",
-                    "Record yourself and review",
-                    "Practice with different audience scenarios"
-                ]
-            }
-        ] 
\ No newline at end of file
+        return list(_DEFAULT_RECOMMENDATIONS) 
\ No newline at end of file
@@ -1,46 +1,86 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Optional
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Request, BackgroundTasks
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import List, Optional, Tuple
 import os
 import uuid
 from pathlib import Path
 import asyncio
 import json
+import hashlib
+from dataclasses import asdict
+import aiofiles
 
 from ..services.video_processor import VideoProcessor
 from ..services.emotion_detector import EmotionDetector
 from ..services.speech_analyzer import SpeechAnalyzer
 from ..services.text_analyzer import TextAnalyzer
+from ..services.analysis_pipeline import run_video_analysis, format_analysis_result, to_plain_data
 from ..agents.coaching_agent import CoachingAgent
 from ..schemas.analysis import AnalysisResponse, UploadResponse
 from ..core.config import settings
+from ..core.cache import LRUCache
+from ..celery_app import celery_app
+from ..tasks import analyze_video_file
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Dependency injection
-def get_video_processor():
-    return VideoProcessor()
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 
-def get_emotion_detector():
-    return EmotionDetector()
+# Dependency injection - services are created once at startup (see main.py)
+# and shared by every request
+async def get_video_processor(request: Request) -> VideoProcessor:
+    return request.app.state.video_processor
 
-def get_speech_analyzer():
-    return SpeechAnalyzer()
+async def get_emotion_detector(request: Request) -> EmotionDetector:
+    return request.app.state.emotion_detector
 
-def get_text_analyzer():
-    return TextAnalyzer()
+async def get_speech_analyzer(request: Request) -> SpeechAnalyzer:
+    return request.app.state.speech_analyzer
 
-def get_coaching_agent():
-    return CoachingAgent()
+async def get_text_analyzer(request: Request) -> TextAnalyzer:
+    return request.app.state.text_analyzer
+
+async def get_coaching_agent(request: Request) -> CoachingAgent:
+    return request.app.state.coaching_agent
+
+async def get_analysis_cache(request: Request) -> LRUCache:
+    return request.app.state.analysis_cache
+
+async def save_upload(upload: UploadFile, file_path: Path) -> Tuple[int, str]:
+    """Stream an upload to disk in chunks, enforcing the size limit as it goes
+    
+    Returns the file size and a hex digest of its content
+    """
+    total_size = 0
+    content_hash = hashlib.blake2b(digest_size=16)
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(status_code=413, detail="File too large")
+                content_hash.update(chunk)
+                await buffer.write(chunk)
+    except HTTPException:
+        file_path.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+    
+    return total_size, content_hash.hexdigest()
 
 @router.post("/videos/analyze")
 async def analyze_video_upload(
+    background_tasks: BackgroundTasks,
     video: UploadFile = File(...),
     video_processor: VideoProcessor = Depends(get_video_processor),
     emotion_detector: EmotionDetector = Depends(get_emotion_detector),
     speech_analyzer: SpeechAnalyzer = Depends(get_speech_analyzer),
     text_analyzer: TextAnalyzer = Depends(get_text_analyzer),
-    coaching_agent: CoachingAgent = Depends(get_coaching_agent)
+    coaching_agent: CoachingAgent = Depends(get_coaching_agent),
+    analysis_cache: LRUCache = Depends(get_analysis_cache)
 ):
     """Upload and analyze a video file in one step"""
     
@@ -49,7 +89,7 @@ async def analyze_video_upload(
     if file_ext not in settings.ALLOWED_VIDEO_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"File type {file_ext} not allowed. Supported: {settings.ALLOWED_VIDEO_EXTENSIONS}"
+            detail=f"File type {file_ext} not allowed. Supported: {sorted(settings.ALLOWED_VIDEO_EXTENSIONS)}"
         )
     
     # Generate unique filename
@@ -61,84 +101,82 @@ async def analyze_video_upload(
     file_path.parent.mkdir(exist_ok=True)
     
     # Save file
-    try:
-        content = await video.read()
-        if len(content) > settings.MAX_UPLOAD_SIZE:
-            raise HTTPException(status_code=413, detail="File too large")
-        
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+    _, content_hash = await save_upload(video, file_path)
+    
+    # Remove the upload after the response is sent
+    background_tasks.add_task(file_path.unlink, missing_ok=True)
     
     try:
-        # Process video and extract components
-        video_data = await video_processor.process_video(str(file_path))
-        
-        # Run parallel analysis
-        tasks = []
-        
-        if settings.ENABLE_EMOTION_DETECTION:
-            tasks.append(emotion_detector.analyze_emotions(video_data["frames"]))
+        # Identical uploads reuse the previous analysis
+        cached = analysis_cache.get(content_hash)
+        if cached is not None:
+            return {"id": file_id, "filename": video.filename, **cached}
         
-        if settings.ENABLE_SPEECH_ANALYSIS:
-            tasks.append(speech_analyzer.analyze_speech(video_data["audio"]))
-        
-        if settings.ENABLE_TEXT_ANALYSIS and video_data.get("transcript"):
-            tasks.append(text_analyzer.analyze_text(video_data["transcript"]))
-        
-        # Execute analysis tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Compile analysis results
-        analysis_data = {
-            "file_id": file_id,
-            "video_metadata": video_data.get("metadata", {}),
-            "emotions": results[0] if len(results) > 0 and not isinstance(results[0], Exception) else {},
-            "speech": results[1] if len(results) > 1 and not isinstance(results[1], Exception) else {},
-            "text": results[2] if len(results) > 2 and not isinstance(results[2], Exception) else {},
-        }
-        
-        # Generate coaching recommendations
-        coaching_recommendations = await coaching_agent.generate_recommendations(analysis_data)
+        analysis_data, coaching_recommendations, video_data = await run_video_analysis(
+            file_id, str(file_path), video_processor, emotion_detector,
+            speech_analyzer, text_analyzer, coaching_agent
+        )
+        result = format_analysis_result(analysis_data, coaching_recommendations, video_data)
+        analysis_cache.put(content_hash, result)
         
-        # Format response to match frontend expectations
-        return {
-            "id": file_id,
-            "filename": video.filename,
-            "analysis": {
-                "overall_score": 78,  # Calculate from analysis data
-                "confidence_level": int((analysis_data.get("speech", {}).get("delivery_metrics", {}).get("confidence_score", 0.8)) * 100),
-                "engagement_score": int((analysis_data.get("emotions", {}).get("analysis_summary", {}).get("engagement_level", 0.75)) * 100),
-                "speech_clarity": int((analysis_data.get("speech", {}).get("delivery_metrics", {}).get("clarity_score", 0.8)) * 100),
-                "body_language": 76,  # Default for now
-                "emotions": analysis_data.get("emotions", {}).get("emotion_scores", {}),
-                "transcript": analysis_data.get("speech", {}).get("transcript", ""),
-                "coaching_feedback": {
-                    "strengths": [rec["title"] for rec in coaching_recommendations if rec.get("priority") == "low"],
-                    "improvements": [rec["description"] for rec in coaching_recommendations if rec.get("priority") == "medium"],
-                    "recommendations": [rec["title"] for rec in coaching_recommendations if rec.get("priority") == "high"]
-                },
-                "metrics": {
-                    "speech_rate": analysis_data.get("speech", {}).get("speaking_rate", 165),
-                    "pause_frequency": 12,  # Default
-                    "filler_words": len(analysis_data.get("speech", {}).get("filler_words", {})),
-                    "gesture_frequency": 23,  # Default
-                    "eye_contact_percentage": 78  # Default
-                }
-            },
-            "created_at": video_data.get("timestamp")
-        }
+        return {"id": file_id, "filename": video.filename, **result}
         
     except Exception as e:
+        # Background tasks don't run for error responses, so clean up now
+        file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        # Clean up uploaded file
-        try:
-            if file_path.exists():
-                file_path.unlink()
-        except Exception:
-            pass  # Ignore cleanup errors
+
+@router.post("/videos/analyze/async", status_code=202)
+async def enqueue_video_analysis(video: UploadFile = File(...)):
+    """Upload a video and queue it for background analysis
+    
+    Poll /videos/result/{task_id} for the result, which has the same shape as /videos/analyze
+    """
+    
+    # Validate file type
+    file_ext = Path(video.filename).suffix.lower()
+    if file_ext not in settings.ALLOWED_VIDEO_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type {file_ext} not allowed. Supported: {sorted(settings.ALLOWED_VIDEO_EXTENSIONS)}"
+        )
+    
+    # Generate unique filename
+    file_id = str(uuid.uuid4())
+    filename = f"{file_id}{file_ext}"
+    file_path = Path(settings.UPLOAD_DIR) / filename
+    
+    # Create upload directory if it doesn't exist
+    file_path.parent.mkdir(exist_ok=True)
+    
+    # Save file
+    await save_upload(video, file_path)
+    
+    # Hand the analysis to a Celery worker; the worker removes the file when done
+    try:
+        task = await asyncio.to_thread(
+            analyze_video_file.delay, str(file_path), file_id, video.filename
+        )
+    except Exception as e:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=503, detail=f"Could not queue analysis: {str(e)}")
+    
+    # A task that was just queued is PENDING; asking the result backend would block the loop for nothing
+    return {"task_id": task.id, "file_id": file_id, "status": "PENDING"}
+
+@router.get("/videos/result/{task_id}")
+async def get_video_analysis_result(task_id: str):
+    """Get the state of a queued analysis, and its result once finished"""
+    task = celery_app.AsyncResult(task_id)
+    state = await asyncio.to_thread(lambda: task.state)
+    
+    response = {"task_id": task_id, "status": state}
+    if state == "SUCCESS":
+        response["result"] = task.result
+    elif state == "FAILURE":
+        response["error"] = str(task.result)
+    
+    return response
 
 @router.get("/videos/history")
 async def get_analysis_history():
@@ -157,7 +195,7 @@ async def upload_video(
     if file_ext not in settings.ALLOWED_VIDEO_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"File type {file_ext} not allowed. Supported: {settings.ALLOWED_VIDEO_EXTENSIONS}"
+            detail=f"File type {file_ext} not allowed. Supported: {sorted(settings.ALLOWED_VIDEO_EXTENSIONS)}"
         )
     
     # Generate unique filename
@@ -169,20 +207,13 @@ async def upload_video(
     file_path.parent.mkdir(exist_ok=True)
     
     # Save file
-    try:
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            if len(content) > settings.MAX_UPLOAD_SIZE:
-                raise HTTPException(status_code=413, detail="File too large")
-            buffer.write(content)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+    file_size, _ = await save_upload(file, file_path)
     
     return UploadResponse(
         file_id=file_id,
         filename=file.filename,
         file_path=str(file_path),
-        file_size=len(content)
+        file_size=file_size
     )
 
 @router.post("/analyze/{file_id}", response_model=AnalysisResponse)
@@ -208,40 +239,15 @@ async def analyze_video(
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        # Process video and extract components
-        video_data = await video_processor.process_video(str(file_path))
-        
-        # Run parallel analysis
-        tasks = []
-        
-        if settings.ENABLE_EMOTION_DETECTION:
-            tasks.append(emotion_detector.analyze_emotions(video_data["frames"]))
-        
-        if settings.ENABLE_SPEECH_ANALYSIS:
-            tasks.append(speech_analyzer.analyze_speech(video_data["audio"]))
-        
-        if settings.ENABLE_TEXT_ANALYSIS and video_data.get("transcript"):
-            tasks.append(text_analyzer.analyze_text(video_data["transcript"]))
-        
-        # Execute analysis tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Compile analysis results
-        analysis_data = {
-            "file_id": file_id,
-            "video_metadata": video_data.get("metadata", {}),
-            "emotions": results[0] if len(results) > 0 and not isinstance(results[0], Exception) else {},
-            "speech": results[1] if len(results) > 1 and not isinstance(results[1], Exception) else {},
-            "text": results[2] if len(results) > 2 and not isinstance(results[2], Exception) else {},
-        }
-        
-        # Generate coaching recommendations
-        coaching_recommendations = await coaching_agent.generate_recommendations(analysis_data)
+        analysis_data, coaching_recommendations, video_data = await run_video_analysis(
+            file_id, str(file_path), video_processor, emotion_detector,
+            speech_analyzer, text_analyzer, coaching_agent
+        )
         
         return AnalysisResponse(
             file_id=file_id,
-            analysis_data=analysis_data,
-            coaching_recommendations=coaching_recommendations,
+            analysis_data=to_plain_data(analysis_data),
+            coaching_recommendations=[asdict(rec) for rec in coaching_recommendations],
             timestamp=video_data.get("timestamp")
         )
         
@@ -1,11 +1,11 @@
 from celery import Celery
 from app.core.config import settings
 
-# Create Celery instance
+# Create Celery instance - broker and results use separate Redis databases
 celery_app = Celery(
     "sales_coach",
-    broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
+    broker=f"{settings.REDIS_URL}/0",
+    backend=f"{settings.REDIS_URL}/1",
     include=['app.tasks']  # Include task modules
 )
 
@@ -21,11 +21,17 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    broker_pool_limit=None,  # No limit on reused broker connections
+    broker_transport_options={'visibility_timeout': 3600},  # 1 hour
+    result_backend_transport_options={'global_keyprefix': 'sc:'},
+    result_expires=3600,  # Evict results after 1 hour
 )
 
 # Optional: Add task routes for different queues
 celery_app.conf.task_routes = {
     'app.tasks.process_video': {'queue': 'video_processing'},
+    'app.tasks.process_video_full': {'queue': 'video_processing'},
+    'app.tasks.analyze_video_file': {'queue': 'video_processing'},
     'app.tasks.analyze_emotions': {'queue': 'ai_analysis'},
     'app.tasks.analyze_speech': {'queue': 'ai_analysis'},
 }
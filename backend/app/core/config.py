@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet
 import os
 
 class Settings(BaseSettings):
@@ -10,13 +10,27 @@ class Settings(BaseSettings):
     # File Upload Settings
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB
     UPLOAD_DIR: str = "uploads"
-    ALLOWED_VIDEO_EXTENSIONS: List[str] = [".mp4", ".avi", ".mov", ".mkv", ".webm"]
+    ALLOWED_VIDEO_EXTENSIONS: FrozenSet[str] = frozenset({".mp4", ".avi", ".mov", ".mkv", ".webm"})
     
     # AI Service Settings
     ENABLE_EMOTION_DETECTION: bool = True
     ENABLE_SPEECH_ANALYSIS: bool = True
     ENABLE_TEXT_ANALYSIS: bool = True
     
+    # Video Processing Settings
+    VIDEO_DECODE_WORKERS: int = os.cpu_count() or 1  # Decode processes; OpenCV/FFmpeg threads are split between them
+    
+    # Placeholder scores reported until the matching analysis exists
+    DEFAULT_OVERALL_SCORE: int = 78
+    DEFAULT_BODY_LANGUAGE_SCORE: int = 76
+    DEFAULT_SPEECH_RATE: int = 165  # words per minute
+    DEFAULT_PAUSE_FREQUENCY: int = 12
+    DEFAULT_GESTURE_FREQUENCY: int = 23
+    DEFAULT_EYE_CONTACT_PERCENTAGE: int = 78
+    
+    # Cache Settings
+    ANALYSIS_CACHE_SIZE: int = 128  # Completed analyses kept in memory, keyed by upload hash
+    
     # External API Keys (set via environment variables)
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
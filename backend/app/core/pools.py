@@ -0,0 +1,20 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+def create_process_pool(
+    max_workers: Optional[int],
+    initializer: Optional[Callable[[], None]] = None
+) -> Optional[ProcessPoolExecutor]:
+    """Create a worker process pool, or return None where child processes are not allowed"""
+    # Daemonic processes (e.g. Celery prefork workers) cannot have children
+    if multiprocessing.current_process().daemon:
+        return None
+    
+    # The API process runs thread pools, OpenCV and numba, and forking it can copy
+    # locks those threads hold; forkserver children start from a clean process instead
+    mp_context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+    
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=initializer)
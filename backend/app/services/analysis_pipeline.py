@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Any, Tuple
+
+from .video_processor import VideoProcessor
+from .emotion_detector import EmotionDetector
+from .speech_analyzer import SpeechAnalyzer
+from .text_analyzer import TextAnalyzer
+from ..agents.coaching_agent import CoachingAgent, Recommendation
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+async def run_video_analysis(
+    file_id: str,
+    file_path: str,
+    video_processor: VideoProcessor,
+    emotion_detector: EmotionDetector,
+    speech_analyzer: SpeechAnalyzer,
+    text_analyzer: TextAnalyzer,
+    coaching_agent: CoachingAgent
+) -> Tuple[Dict[str, Any], List[Recommendation], Dict[str, Any]]:
+    """
+    Run the full multimodal analysis for a stored video
+    
+    Shared by the API routes and the Celery worker.
+    
+    Returns:
+        Tuple of (analysis data, coaching recommendations, processed video data)
+    """
+    # Process video and extract components
+    video_data = await video_processor.process_video(file_path)
+    
+    # Run parallel analysis - each task starts as soon as it is created
+    tasks = {}
+    
+    if settings.ENABLE_EMOTION_DETECTION:
+        tasks["emotions"] = asyncio.create_task(emotion_detector.analyze_emotions(video_data["frames_gray"]))
+    
+    if settings.ENABLE_SPEECH_ANALYSIS:
+        tasks["speech"] = asyncio.create_task(speech_analyzer.analyze_speech(video_data["audio"]))
+    
+    if settings.ENABLE_TEXT_ANALYSIS and video_data.get("transcript"):
+        tasks["text"] = asyncio.create_task(text_analyzer.analyze_text(video_data["transcript"]))
+    
+    # Wait for all analysis tasks
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    completed = {
+        name: result for name, result in zip(tasks, results)
+        if not isinstance(result, Exception)
+    }
+    
+    # Compile analysis results
+    analysis_data = {
+        "file_id": file_id,
+        "video_metadata": video_data.get("metadata", {}),
+        "emotions": completed.get("emotions", {}),
+        "speech": completed.get("speech", {}),
+        "text": completed.get("text", {}),
+    }
+    
+    # Generate coaching recommendations
+    coaching_recommendations = await coaching_agent.generate_recommendations(analysis_data)
+    
+    return analysis_data, coaching_recommendations, video_data
+
+def to_plain_data(value: Any) -> Any:
+    """Copy nested analysis results into plain dicts and lists (e.g. read-only mappings and tuples)"""
+    if isinstance(value, Mapping):
+        return {key: to_plain_data(item) for key, item in value.items()}
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return [to_plain_data(item) for item in value]
+    return value
+
+def format_analysis_result(
+    analysis_data: Dict[str, Any],
+    coaching_recommendations: List[Recommendation],
+    video_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Format analysis results to match frontend expectations"""
+    # Split recommendations by priority in a single pass
+    strengths, improvements, recommendations = [], [], []
+    for rec in coaching_recommendations:
+        priority = rec.priority
+        if priority == "low":
+            strengths.append(rec.title)
+        elif priority == "medium":
+            improvements.append(rec.description)
+        elif priority == "high":
+            recommendations.append(rec.title)
+    
+    # Look up the nested analysis sections once
+    speech = analysis_data.get("speech") or {}
+    delivery = speech.get("delivery_metrics") or {}
+    emotions = analysis_data.get("emotions") or {}
+    emotion_summary = emotions.get("analysis_summary") or {}
+    
+    return {
+        "analysis": {
+            "overall_score": settings.DEFAULT_OVERALL_SCORE,  # Calculate from analysis data
+            "confidence_level": int(delivery.get("confidence_score", 0.8) * 100),
+            "engagement_score": int(emotion_summary.get("engagement_level", 0.75) * 100),
+            "speech_clarity": int(delivery.get("clarity_score", 0.8) * 100),
+            "body_language": settings.DEFAULT_BODY_LANGUAGE_SCORE,  # Default for now
+            "emotions": emotions.get("emotion_scores", {}),
+            "transcript": speech.get("transcript", ""),
+            "coaching_feedback": {
+                "strengths": strengths,
+                "improvements": improvements,
+                "recommendations": recommendations
+            },
+            "metrics": {
+                "speech_rate": speech.get("speaking_rate", settings.DEFAULT_SPEECH_RATE),
+                "pause_frequency": settings.DEFAULT_PAUSE_FREQUENCY,  # Default
+                "filler_words": len(speech.get("filler_words", {})),
+                "gesture_frequency": settings.DEFAULT_GESTURE_FREQUENCY,  # Default
+                "eye_contact_percentage": settings.DEFAULT_EYE_CONTACT_PERCENTAGE  # Default
+            }
+        },
+        "created_at": video_data.get("timestamp")
+    }
@@ -1,12 +1,154 @@
 import asyncio
 import logging
-from typing import Dict, List, Any
+import os
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
 import re
+import hashlib
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 import numpy as np
+from numba import njit
+from ..core.cache import LRUCache
+from ..core.pools import create_process_pool
 
 logger = logging.getLogger(__name__)
 
+# Number of recent text analyses kept, keyed by a hash of the text
+TEXT_CACHE_SIZE = 256
+
+# Shorter texts are analyzed on the default thread pool, where they finish faster than the IPC round-trip
+PROCESS_POOL_MIN_CHARS = 500
+
+# Result returned when analysis fails; callers get a shallow copy, so the shared
+# empty containers inside must not be mutated
+_DEFAULT_TEXT_DATA: Mapping[str, Any] = MappingProxyType({
+    "sentiment": "neutral",
+    "sentiment_score": 0.0,
+    "key_phrases": [],
+    "professionalism_score": 0.0,
+    "clarity_score": 0.0,
+    "persuasiveness_score": 0.0,
+    "word_count": 0,
+    "sentence_count": 0,
+    "detailed_analysis": {},
+    "recommendations": []
+})
+
+# Patterns compiled once at import time
+_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+_STRUCTURE_RE = re.compile(
+    r'\b(?:(?P<cta>call|contact|reach|schedule|book|sign|register)'
+    r'|(?P<urgency>now|today|immediately|limited|exclusive|urgent)'
+    r'|(?P<benefit>benefit|advantage|gain|improve|increase|save))\b'
+)
+_CAP_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_NOUN_PHRASE_RE = re.compile(r'\b(?:our|the|a|an)\s+\w+(?:\s+\w+)*(?:\s+(?:solution|product|service|platform|system|approach|strategy|method))\b')
+_BENEFIT_PHRASE_RE = re.compile(r'\b(?:increase|improve|enhance|reduce|save|boost|optimize)\s+\w+(?:\s+\w+)*\b')
+_NUMBER_PHRASE_RE = re.compile(r'\b\d+%?\s+\w+(?:\s+\w+)*\b')
+_STYLE_RE = re.compile(
+    r'\b(?:(?P<first>I|me|my|myself)'
+    r'|(?P<second>you|your|yourself)'
+    r'|(?P<third>he|she|they|them|their))\b',
+    re.IGNORECASE
+)
+
+# Vocabulary categories in bit order of the category masks built by TextAnalyzer
+_CATEGORIES = ("positive", "negative", "persuasive", "professional", "casual", "emphasis")
+_N_CATEGORIES = len(_CATEGORIES)
+
+@njit("int64[:](int32[:], uint8[:])", cache=True)
+def _tally(ids, masks):
+    """Count tokens per category in one sweep over vocabulary ids (-1 = not in any vocabulary)"""
+    counts = np.zeros(_N_CATEGORIES, np.int64)
+    for i in range(ids.shape[0]):
+        v = ids[i]
+        if v >= 0:
+            m = masks[v]
+            for b in range(_N_CATEGORIES):
+                if m & (1 << b):
+                    counts[b] += 1
+    return counts
+
+@dataclass(slots=True)
+class SentimentResult:
+    """Sentiment breakdown produced by TextAnalyzer"""
+    sentiment: str
+    score: float
+    positive_words_count: int
+    negative_words_count: int
+    positive_words: List[str]
+    negative_words: List[str]
+
+@dataclass(slots=True)
+class PersuasivenessResult:
+    """Persuasiveness breakdown produced by TextAnalyzer"""
+    score: float
+    persuasive_words_count: int
+    persuasive_words: List[str]
+    call_to_action_count: int
+    urgency_indicators: int
+    benefit_statements: int
+    structure_score: float
+    vocabulary_score: float
+
+@dataclass(slots=True)
+class ProfessionalismResult:
+    """Professionalism breakdown produced by TextAnalyzer"""
+    score: float
+    professional_words_count: int
+    professional_words: List[str]
+    casual_words_count: int
+    vocabulary_score: float
+    casual_penalty: float
+
+@dataclass(slots=True)
+class ClarityResult:
+    """Clarity and readability breakdown produced by TextAnalyzer"""
+    score: float
+    average_sentence_length: float
+    complex_word_ratio: float
+    sentence_count: int
+    readability_level: str
+
+@dataclass(slots=True)
+class StyleResult:
+    """Communication style breakdown produced by TextAnalyzer"""
+    first_person_usage: int
+    second_person_usage: int
+    third_person_usage: int
+    question_count: int
+    emphasis_word_count: int
+    style_indicators: Dict[str, bool]
+
+def _as_dict(result) -> Dict[str, Any]:
+    """Shallow dict of a result dataclass; unlike dataclasses.asdict, word lists are not deep-copied"""
+    return {field.name: getattr(result, field.name) for field in fields(result)}
+
+@dataclass(slots=True)
+class _TextCtx:
+    """Text tokenized and split once, shared by every analysis helper"""
+    raw: str
+    lower: str
+    tokens: List[str]
+    sentence_parts: List[str]  # raw split on sentence punctuation, including empty pieces
+    sentences: List[str]  # stripped, non-empty sentences
+    category_counts: Dict[str, int]
+    words_by_category: Optional[Dict[str, List[str]]] = None  # filled by the first helper that needs the detail lists
+
+# Analyzer owned by each process-pool worker, built once by the pool initializer
+_worker_analyzer: Optional["TextAnalyzer"] = None
+
+def _init_worker() -> None:
+    """Process-pool initializer: build the vocabularies once per worker"""
+    global _worker_analyzer
+    _worker_analyzer = TextAnalyzer()
+
+def _analyze_in_worker(text: str) -> Dict[str, Any]:
+    """Run the synchronous analysis inside a process-pool worker"""
+    return _worker_analyzer._analyze_text_sync(text)
+
 class TextAnalyzer:
     """Service for analyzing text content for sentiment, persuasiveness, and communication effectiveness"""
     
@@ -38,6 +180,33 @@ class TextAnalyzer:
             'performance', 'methodology', 'framework', 'analysis', 'evaluation',
             'assessment', 'recommendation', 'proposal', 'initiative', 'objective'
         ]
+        
+        # Casual vocabulary that lowers professionalism
+        self.casual_words = ['like', 'yeah', 'okay', 'cool', 'awesome', 'stuff', 'things']
+        
+        # Emphasis words
+        self.emphasis_words = ['very', 'really', 'extremely', 'absolutely', 'definitely', 'certainly']
+        
+        # Integer ids for every vocabulary word, each mapped to a bitmask of its categories
+        vocabularies = (
+            self.positive_words, self.negative_words, self.persuasive_words,
+            self.professional_words, self.casual_words, self.emphasis_words
+        )
+        self._vocab_id = {}
+        masks = []
+        for bit, word_list in enumerate(vocabularies):
+            for word in word_list:
+                if word not in self._vocab_id:
+                    self._vocab_id[word] = len(masks)
+                    masks.append(0)
+                masks[self._vocab_id[word]] |= 1 << bit
+        self._cat_mask = np.array(masks, dtype=np.uint8)
+        self._word_mask = {word: masks[i] for word, i in self._vocab_id.items()}
+        
+        self._cache = LRUCache(maxsize=TEXT_CACHE_SIZE)
+        
+        # Created on first use so workers that never see a long text don't spawn processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """
@@ -52,82 +221,131 @@ class TextAnalyzer:
         try:
             logger.info("Analyzing text content")
             
-            # Run analysis in thread pool for CPU-intensive operations
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                self._analyze_text_sync, 
-                text
-            )
+            key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+            result = self._cache.get(key)
+            if result is not None:
+                return result
+            
+            # Long texts go to worker processes so concurrent analyses aren't serialized on the GIL
+            loop = asyncio.get_running_loop()
+            pool = self._get_process_pool() if len(text) >= PROCESS_POOL_MIN_CHARS else None
+            if pool is not None:
+                result = await loop.run_in_executor(pool, _analyze_in_worker, text)
+            else:
+                result = await loop.run_in_executor(None, self._analyze_text_sync, text)
             
+            self._cache.put(key, result)
             return result
             
         except Exception as e:
             logger.error(f"Error analyzing text: {str(e)}")
             return self._get_default_text_data()
     
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the worker process pool, or None where child processes are not allowed"""
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(os.cpu_count(), _init_worker)
+        return self._process_pool
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+    
     def _analyze_text_sync(self, text: str) -> Dict[str, Any]:
         """Synchronous text analysis"""
         if not text or not text.strip():
             return self._get_default_text_data()
         
-        # Basic text preprocessing
-        cleaned_text = self._preprocess_text(text)
-        words = cleaned_text.split()
+        ctx = self._build_context(text)
         
         # Sentiment analysis
-        sentiment_data = self._analyze_sentiment(cleaned_text, words)
+        sentiment_data = self._analyze_sentiment(ctx)
         
         # Persuasiveness analysis
-        persuasiveness_data = self._analyze_persuasiveness(cleaned_text, words)
+        persuasiveness_data = self._analyze_persuasiveness(ctx)
         
         # Professionalism analysis
-        professionalism_data = self._analyze_professionalism(cleaned_text, words)
+        professionalism_data = self._analyze_professionalism(ctx)
         
         # Clarity analysis
-        clarity_data = self._analyze_clarity(text, words)
+        clarity_data = self._analyze_clarity(ctx)
         
         # Key phrase extraction
-        key_phrases = self._extract_key_phrases(cleaned_text)
+        key_phrases = self._extract_key_phrases(ctx.lower)
         
         # Communication style analysis
-        style_analysis = self._analyze_communication_style(text, words)
+        style_analysis = self._analyze_communication_style(ctx)
         
         return {
-            "sentiment": sentiment_data["sentiment"],
-            "sentiment_score": sentiment_data["score"],
+            "sentiment": sentiment_data.sentiment,
+            "sentiment_score": sentiment_data.score,
             "key_phrases": key_phrases,
-            "professionalism_score": professionalism_data["score"],
-            "clarity_score": clarity_data["score"],
-            "persuasiveness_score": persuasiveness_data["score"],
-            "word_count": len(words),
-            "sentence_count": len(re.split(r'[.!?]+', text)),
+            "professionalism_score": professionalism_data.score,
+            "clarity_score": clarity_data.score,
+            "persuasiveness_score": persuasiveness_data.score,
+            "word_count": len(ctx.tokens),
+            "sentence_count": len(ctx.sentence_parts),
             "detailed_analysis": {
-                "sentiment_breakdown": sentiment_data,
-                "persuasiveness_breakdown": persuasiveness_data,
-                "professionalism_breakdown": professionalism_data,
-                "clarity_breakdown": clarity_data,
-                "communication_style": style_analysis
+                "sentiment_breakdown": _as_dict(sentiment_data),
+                "persuasiveness_breakdown": _as_dict(persuasiveness_data),
+                "professionalism_breakdown": _as_dict(professionalism_data),
+                "clarity_breakdown": _as_dict(clarity_data),
+                "communication_style": _as_dict(style_analysis)
             },
-            "recommendations": self._generate_text_recommendations({
-                "sentiment": sentiment_data,
-                "persuasiveness": persuasiveness_data,
-                "professionalism": professionalism_data,
-                "clarity": clarity_data
-            })
+            "recommendations": self._generate_text_recommendations(
+                sentiment_data, persuasiveness_data, professionalism_data, clarity_data
+            )
         }
     
+    def _build_context(self, text: str) -> _TextCtx:
+        """Preprocess, tokenize and sentence-split the text once"""
+        # Basic text preprocessing
+        cleaned_text = self._preprocess_text(text)
+        # Cleaned text is single-space separated, so the plain separator split is exact
+        words = cleaned_text.split(' ')
+        
+        sentence_parts = _SENTENCE_SPLIT.split(text)
+        sentences = [s.strip() for s in sentence_parts if s.strip()]
+        
+        # Tally every vocabulary category in a single compiled pass
+        ids = np.fromiter((self._vocab_id.get(word, -1) for word in words), dtype=np.int32, count=len(words))
+        category_counts = dict(zip(_CATEGORIES, _tally(ids, self._cat_mask).tolist()))
+        
+        return _TextCtx(
+            raw=text,
+            lower=cleaned_text,
+            tokens=words,
+            sentence_parts=sentence_parts,
+            sentences=sentences,
+            category_counts=category_counts
+        )
+    
+    def _category_words(self, ctx: _TextCtx) -> Dict[str, List[str]]:
+        """Vocabulary tokens of every category in text order, collected in one pass and kept on ctx"""
+        if ctx.words_by_category is None:
+            buckets = [[] for _ in _CATEGORIES]
+            word_mask = self._word_mask
+            for word in ctx.tokens:
+                mask = word_mask.get(word)
+                if mask:
+                    for bit, bucket in enumerate(buckets):
+                        if mask & (1 << bit):
+                            bucket.append(word)
+            ctx.words_by_category = dict(zip(_CATEGORIES, buckets))
+        return ctx.words_by_category
+    
     def _preprocess_text(self, text: str) -> str:
         """Clean and preprocess text"""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Convert to lowercase for analysis
-        return text.lower()
+        # Lowercase for analysis and collapse whitespace runs, both in C-level string passes
+        return ' '.join(text.lower().split())
     
-    def _analyze_sentiment(self, text: str, words: List[str]) -> Dict[str, Any]:
+    def _analyze_sentiment(self, ctx: _TextCtx) -> SentimentResult:
         """Analyze sentiment of the text"""
-        positive_count = sum(1 for word in words if word in self.positive_words)
-        negative_count = sum(1 for word in words if word in self.negative_words)
+        words = ctx.tokens
+        positive_count = ctx.category_counts["positive"]
+        negative_count = ctx.category_counts["negative"]
         
         # Calculate sentiment score
         total_sentiment_words = positive_count + negative_count
@@ -143,24 +361,27 @@ class TextAnalyzer:
             else:
                 sentiment = "neutral"
         
-        return {
-            "sentiment": sentiment,
-            "score": sentiment_score,
-            "positive_words_count": positive_count,
-            "negative_words_count": negative_count,
-            "positive_words": [word for word in words if word in self.positive_words],
-            "negative_words": [word for word in words if word in self.negative_words]
-        }
+        category_words = self._category_words(ctx)
+        return SentimentResult(
+            sentiment=sentiment,
+            score=sentiment_score,
+            positive_words_count=positive_count,
+            negative_words_count=negative_count,
+            positive_words=category_words["positive"],
+            negative_words=category_words["negative"]
+        )
     
-    def _analyze_persuasiveness(self, text: str, words: List[str]) -> Dict[str, Any]:
+    def _analyze_persuasiveness(self, ctx: _TextCtx) -> PersuasivenessResult:
         """Analyze persuasiveness of the text"""
-        persuasive_count = sum(1 for word in words if word in self.persuasive_words)
+        words = ctx.tokens
+        persuasive_count = ctx.category_counts["persuasive"]
         persuasive_ratio = persuasive_count / len(words) if words else 0
         
-        # Check for persuasive structures
-        call_to_action = len(re.findall(r'\b(call|contact|reach|schedule|book|sign|register)\b', text))
-        urgency_indicators = len(re.findall(r'\b(now|today|immediately|limited|exclusive|urgent)\b', text))
-        benefit_statements = len(re.findall(r'\b(benefit|advantage|gain|improve|increase|save)\b', text))
+        # Check for persuasive structures in a single scan
+        structures = Counter(match.lastgroup for match in _STRUCTURE_RE.finditer(ctx.lower))
+        call_to_action = structures["cta"]
+        urgency_indicators = structures["urgency"]
+        benefit_statements = structures["benefit"]
         
         # Calculate overall persuasiveness score
         structure_score = min(1.0, (call_to_action + urgency_indicators + benefit_statements) / 10)
@@ -168,28 +389,28 @@ class TextAnalyzer:
         
         persuasiveness_score = (structure_score + vocabulary_score) / 2
         
-        return {
-            "score": persuasiveness_score,
-            "persuasive_words_count": persuasive_count,
-            "persuasive_words": [word for word in words if word in self.persuasive_words],
-            "call_to_action_count": call_to_action,
-            "urgency_indicators": urgency_indicators,
-            "benefit_statements": benefit_statements,
-            "structure_score": structure_score,
-            "vocabulary_score": vocabulary_score
-        }
+        return PersuasivenessResult(
+            score=persuasiveness_score,
+            persuasive_words_count=persuasive_count,
+            persuasive_words=self._category_words(ctx)["persuasive"],
+            call_to_action_count=call_to_action,
+            urgency_indicators=urgency_indicators,
+            benefit_statements=benefit_statements,
+            structure_score=structure_score,
+            vocabulary_score=vocabulary_score
+        )
     
-    def _analyze_professionalism(self, text: str, words: List[str]) -> Dict[str, Any]:
+    def _analyze_professionalism(self, ctx: _TextCtx) -> ProfessionalismResult:
         """Analyze professionalism of the text"""
-        professional_count = sum(1 for word in words if word in self.professional_words)
+        words = ctx.tokens
+        professional_count = ctx.category_counts["professional"]
         professional_ratio = professional_count / len(words) if words else 0
         
         # Check for unprofessional elements
-        casual_words = ['like', 'yeah', 'okay', 'cool', 'awesome', 'stuff', 'things']
-        casual_count = sum(1 for word in words if word in casual_words)
+        casual_count = ctx.category_counts["casual"]
         
         # Check for proper grammar indicators (simplified)
-        proper_capitalization = len(re.findall(r'\b[A-Z][a-z]+\b', text)) / len(words) if words else 0
+        proper_capitalization = len(_CAP_RE.findall(ctx.lower)) / len(words) if words else 0
         
         # Calculate professionalism score
         vocabulary_score = min(1.0, professional_ratio * 15)
@@ -197,26 +418,27 @@ class TextAnalyzer:
         
         professionalism_score = max(0.0, vocabulary_score - casual_penalty + 0.5)
         
-        return {
-            "score": min(1.0, professionalism_score),
-            "professional_words_count": professional_count,
-            "professional_words": [word for word in words if word in self.professional_words],
-            "casual_words_count": casual_count,
-            "vocabulary_score": vocabulary_score,
-            "casual_penalty": casual_penalty
-        }
+        return ProfessionalismResult(
+            score=min(1.0, professionalism_score),
+            professional_words_count=professional_count,
+            professional_words=self._category_words(ctx)["professional"],
+            casual_words_count=casual_count,
+            vocabulary_score=vocabulary_score,
+            casual_penalty=casual_penalty
+        )
     
-    def _analyze_clarity(self, original_text: str, words: List[str]) -> Dict[str, Any]:
+    def _analyze_clarity(self, ctx: _TextCtx) -> ClarityResult:
         """Analyze clarity and readability of the text"""
-        sentences = re.split(r'[.!?]+', original_text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        words = ctx.tokens
+        sentences = ctx.sentences
         
         # Average sentence length
-        avg_sentence_length = np.mean([len(s.split()) for s in sentences]) if sentences else 0
+        sentence_lengths = np.fromiter((len(s.split()) for s in sentences), dtype=np.int32, count=len(sentences))
+        avg_sentence_length = float(sentence_lengths.mean()) if sentence_lengths.size else 0.0
         
         # Complex words (words with 3+ syllables, simplified estimation)
-        complex_words = [word for word in words if len(word) > 8]
-        complex_word_ratio = len(complex_words) / len(words) if words else 0
+        word_lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+        complex_word_ratio = int((word_lengths > 8).sum()) / word_lengths.size if word_lengths.size else 0.0
         
         # Readability score (simplified Flesch-like calculation)
         if sentences and words:
@@ -225,13 +447,13 @@ class TextAnalyzer:
         else:
             readability_score = 0.0
         
-        return {
-            "score": readability_score,
-            "average_sentence_length": avg_sentence_length,
-            "complex_word_ratio": complex_word_ratio,
-            "sentence_count": len(sentences),
-            "readability_level": self._get_readability_level(readability_score)
-        }
+        return ClarityResult(
+            score=readability_score,
+            average_sentence_length=avg_sentence_length,
+            complex_word_ratio=complex_word_ratio,
+            sentence_count=len(sentences),
+            readability_level=self._get_readability_level(readability_score)
+        )
     
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases from the text"""
@@ -239,46 +461,47 @@ class TextAnalyzer:
         phrases = []
         
         # Look for noun phrases (simplified)
-        noun_phrases = re.findall(r'\b(?:our|the|a|an)\s+\w+(?:\s+\w+)*(?:\s+(?:solution|product|service|platform|system|approach|strategy|method))\b', text)
+        noun_phrases = _NOUN_PHRASE_RE.findall(text)
         phrases.extend(noun_phrases[:5])  # Limit to top 5
         
         # Look for benefit phrases
-        benefit_phrases = re.findall(r'\b(?:increase|improve|enhance|reduce|save|boost|optimize)\s+\w+(?:\s+\w+)*\b', text)
+        benefit_phrases = _BENEFIT_PHRASE_RE.findall(text)
         phrases.extend(benefit_phrases[:3])
         
         # Look for quantified benefits
-        number_phrases = re.findall(r'\b\d+%?\s+\w+(?:\s+\w+)*\b', text)
+        number_phrases = _NUMBER_PHRASE_RE.findall(text)
         phrases.extend(number_phrases[:3])
         
         return list(set(phrases))  # Remove duplicates
     
-    def _analyze_communication_style(self, text: str, words: List[str]) -> Dict[str, Any]:
+    def _analyze_communication_style(self, ctx: _TextCtx) -> StyleResult:
         """Analyze communication style"""
-        # Personal pronouns usage
-        first_person = len(re.findall(r'\b(I|me|my|myself)\b', text, re.IGNORECASE))
-        second_person = len(re.findall(r'\b(you|your|yourself)\b', text, re.IGNORECASE))
-        third_person = len(re.findall(r'\b(he|she|they|them|their)\b', text, re.IGNORECASE))
+        text = ctx.raw
+        # Personal pronouns usage, bucketed from a single scan
+        pronouns = Counter(match.lastgroup for match in _STYLE_RE.finditer(text))
+        first_person = pronouns["first"]
+        second_person = pronouns["second"]
+        third_person = pronouns["third"]
         
         # Question usage
-        questions = len(re.findall(r'\?', text))
+        questions = text.count('?')
         
         # Emphasis words
-        emphasis_words = ['very', 'really', 'extremely', 'absolutely', 'definitely', 'certainly']
-        emphasis_count = sum(1 for word in words if word in emphasis_words)
-        
-        return {
-            "first_person_usage": first_person,
-            "second_person_usage": second_person,
-            "third_person_usage": third_person,
-            "question_count": questions,
-            "emphasis_word_count": emphasis_count,
-            "style_indicators": {
+        emphasis_count = ctx.category_counts["emphasis"]
+        
+        return StyleResult(
+            first_person_usage=first_person,
+            second_person_usage=second_person,
+            third_person_usage=third_person,
+            question_count=questions,
+            emphasis_word_count=emphasis_count,
+            style_indicators={
                 "personal": first_person > second_person,
                 "engaging": second_person > 0,
                 "interactive": questions > 0,
                 "emphatic": emphasis_count > 0
             }
-        }
+        )
     
     def _get_readability_level(self, score: float) -> str:
         """Convert readability score to level description"""
@@ -295,12 +518,18 @@ class TextAnalyzer:
         else:
             return "Difficult"
     
-    def _generate_text_recommendations(self, analysis: Dict) -> List[Dict[str, str]]:
+    def _generate_text_recommendations(
+        self,
+        sentiment: SentimentResult,
+        persuasiveness: PersuasivenessResult,
+        professionalism: ProfessionalismResult,
+        clarity: ClarityResult
+    ) -> List[Dict[str, str]]:
         """Generate recommendations for text improvement"""
         recommendations = []
         
         # Sentiment recommendations
-        if analysis["sentiment"]["score"] < 0:
+        if sentiment.score < 0:
             recommendations.append({
                 "category": "tone",
                 "priority": "high",
@@ -309,7 +538,7 @@ class TextAnalyzer:
             })
         
         # Persuasiveness recommendations
-        if analysis["persuasiveness"]["score"] < 0.5:
+        if persuasiveness.score < 0.5:
             recommendations.append({
                 "category": "persuasion",
                 "priority": "medium",
@@ -318,7 +547,7 @@ class TextAnalyzer:
             })
         
         # Professionalism recommendations
-        if analysis["professionalism"]["score"] < 0.7:
+        if professionalism.score < 0.7:
             recommendations.append({
                 "category": "professionalism",
                 "priority": "medium",
@@ -327,7 +556,7 @@ class TextAnalyzer:
             })
         
         # Clarity recommendations
-        if analysis["clarity"]["score"] < 0.6:
+        if clarity.score < 0.6:
             recommendations.append({
                 "category": "clarity",
                 "priority": "high",
@@ -339,15 +568,4 @@ class TextAnalyzer:
     
     def _get_default_text_data(self) -> Dict[str, Any]:
         """Return default text data when analysis fails"""
-        return {
-            "sentiment": "neutral",
-            "sentiment_score": 0.0,
-            "key_phrases": [],
-            "professionalism_score": 0.0,
-            "clarity_score": 0.0,
-            "persuasiveness_score": 0.0,
-            "word_count": 0,
-            "sentence_count": 0,
-            "detailed_analysis": {},
-            "recommendations": []
-        } 
\ No newline at end of file
+        return dict(_DEFAULT_TEXT_DATA) 
\ No newline at end of file
@@ -1,20 +1,146 @@
+import av
 import cv2
 import numpy as np
+from numba import njit
 from pathlib import Path
+from types import MappingProxyType
 import tempfile
 import asyncio
-from typing import Dict, List, Any
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 import logging
 from datetime import datetime
 
+from ..core.config import settings
+from ..core.pools import create_process_pool
+
 logger = logging.getLogger(__name__)
 
+# Each decode worker process gets an equal share of the cores; more threads per process would oversubscribe them
+DECODE_THREADS = max(1, (os.cpu_count() or 1) // max(1, settings.VIDEO_DECODE_WORKERS))
+
+# Assumed keyframe spacing; the OpenCV fallback only seeks when samples are further apart than this
+KEYFRAME_GAP = 250
+
+# Build-information entries that indicate OpenCV's FFmpeg backend can decode on the GPU
+_HW_DECODE_RE = re.compile(r"^\s*(?:VA|VA Intel|Intel Media SDK|NVIDIA CUDA|NVCUVID|D3D11|VideoToolbox):\s*YES", re.MULTILINE)
+
+def _detect_capture_params() -> List[int]:
+    """Build the VideoCapture hardware-decode hints once, or none if this OpenCV build lacks support"""
+    if not hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        return []
+    if not _HW_DECODE_RE.search(cv2.getBuildInformation()):
+        return []
+    
+    # OpenCV rejects an explicit CAP_PROP_HW_DEVICE with ANY acceleration, so let it pick the device
+    return [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+
+# Computed at import so each capture reuses the same params instead of re-parsing the build info
+CAPTURE_PARAMS = _detect_capture_params()
+
+# Capture properties read for the metadata, in unpacking order
+METADATA_PROPS = (cv2.CAP_PROP_FPS, cv2.CAP_PROP_FRAME_COUNT, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT)
+
+# Frames stay 8-bit luma end to end; consumers normalize inside their model wrapper, not on these buffers
+FRAME_DTYPE = np.uint8
+
+# Size of the luma thumbnails compared to score how much each frame differs from the previous one
+SCORE_THUMBNAIL_SIZE = (160, 90)
+
+# Eager signature: compiled at import (or loaded from the on-disk cache), not on the first video
+@njit("f4(u1[:, :], u1[:, :])", cache=True, fastmath=True)
+def _frame_difference(prev, cur):
+    """Mean absolute luma difference between two equally sized grayscale frames"""
+    rows, cols = cur.shape
+    total = 0.0
+    for r in range(rows):
+        for c in range(cols):
+            total += abs(np.int32(cur[r, c]) - np.int32(prev[r, c]))
+    return total / (rows * cols)
+
+# Mock outputs are shared read-only singletons rather than rebuilt for every video
+_MOCK_AUDIO: Mapping[str, Any] = MappingProxyType({
+    "sample_rate": 44100,
+    "duration": 30.5,
+    "channels": 2,
+    "format": "wav",
+    "audio_file_path": None,  # Would contain path to extracted audio
+    "volume_analysis": MappingProxyType({
+        "average_volume": 0.65,
+        "peak_volume": 0.89,
+        "silence_periods": (MappingProxyType({"start": 2.3, "end": 3.1}),)
+    })
+})
+
+_MOCK_TRANSCRIPT = """Hello, I'm excited to present our new product to you today. 
+        This solution can help your company increase efficiency by up to 40%. 
+        Let me walk you through the key features and benefits. 
+        As you can see from this demonstration, the interface is intuitive and user-friendly. 
+        I believe this would be a perfect fit for your organization's needs."""
+
+_worker_processor: Optional["VideoProcessor"] = None
+
+def _init_worker() -> None:
+    """Process-pool initializer: build the processor once per worker, limited to its share of threads"""
+    global _worker_processor
+    # Only decode workers are limited; the API process keeps OpenCV's default threading
+    cv2.setNumThreads(DECODE_THREADS)
+    _worker_processor = VideoProcessor(decode_threads=DECODE_THREADS)
+
+def _decode_in_worker(video_path: Path) -> Tuple[Dict[str, Any], str, Tuple[int, ...]]:
+    """
+    Decode frames inside a process-pool worker, returning them through shared memory
+    
+    Returns:
+        Tuple of (metadata, shared memory block name, frame array shape)
+    """
+    metadata, frames = _worker_processor._extract_frames_and_metadata(video_path)
+    
+    # The parent attaches to the block by name instead of unpickling the frame bytes
+    shm = shared_memory.SharedMemory(create=True, size=max(frames.nbytes, 1))
+    try:
+        np.ndarray(frames.shape, dtype=FRAME_DTYPE, buffer=shm.buf)[...] = frames
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    
+    # Ownership passes to the parent, which unlinks the block; drop the worker's
+    # tracker entry so the block is not also reported (and removed) as leaked here
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return metadata, shm.name, frames.shape
+
+def _take_shared_frames(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """Copy frames out of a worker's shared memory block and free the block"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=FRAME_DTYPE, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _discard_shared_frames(future: Future) -> None:
+    """Free the shared memory block of a worker decode whose caller stopped waiting for it"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    
+    _, name, _ = future.result()
+    shm = shared_memory.SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
 class VideoProcessor:
     """Service for processing video files and extracting frames and audio"""
     
-    def __init__(self):
-        self.temp_dir = Path(tempfile.gettempdir()) / "video_processing"
-        self.temp_dir.mkdir(exist_ok=True)
+    def __init__(self, decode_threads: int = 0):
+        # libavcodec threads per opened video; 0 leaves the choice to FFmpeg
+        self.decode_threads = decode_threads
+        self._process_pool: Optional[ProcessPoolExecutor] = None
     
     async def process_video(self, video_path: str) -> Dict[str, Any]:
         """
@@ -29,29 +155,71 @@ class VideoProcessor:
         try:
             logger.info(f"Processing video: {video_path}")
             
-            # Run CPU-intensive operations in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                self._process_video_sync, 
-                video_path
-            )
+            video_path = Path(video_path)
+            if not video_path.exists():
+                raise FileNotFoundError(f"Video file not found: {video_path}")
+            
+            # Scratch files for this video only; removed as soon as processing finishes
+            with tempfile.TemporaryDirectory(prefix="vp_") as work_dir:
+                # Decode frames, extract audio and transcribe concurrently; total time is the slowest of the three
+                loop = asyncio.get_running_loop()
+                (metadata, frames_gray), audio_data, transcript = await asyncio.gather(
+                    self._decode(loop, video_path),
+                    loop.run_in_executor(None, self._extract_audio_mock, video_path, Path(work_dir)),
+                    self._transcribe(video_path)
+                )
             
-            return result
+            return {
+                "metadata": metadata,
+                "frames_gray": frames_gray,
+                "audio": audio_data,
+                "transcript": transcript,
+                "timestamp": datetime.now().isoformat()
+            }
             
         except Exception as e:
             logger.error(f"Error processing video {video_path}: {str(e)}")
             raise Exception(f"Video processing failed: {str(e)}")
     
-    def _process_video_sync(self, video_path: str) -> Dict[str, Any]:
-        """Synchronous video processing"""
-        video_path = Path(video_path)
+    async def _decode(self, loop: asyncio.AbstractEventLoop, video_path: Path) -> Tuple[Dict[str, Any], np.ndarray]:
+        """Extract metadata and frames on the process pool, or on a thread where there is none"""
+        pool = self._get_process_pool()
+        if pool is None:
+            return await loop.run_in_executor(None, self._extract_frames_and_metadata, video_path)
         
-        if not video_path.exists():
-            raise FileNotFoundError(f"Video file not found: {video_path}")
+        future = pool.submit(_decode_in_worker, video_path)
+        try:
+            metadata, shm_name, shape = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A running decode still finishes in the worker; free its block then rather than leak it
+            future.add_done_callback(_discard_shared_frames)
+            raise
+        return metadata, _take_shared_frames(shm_name, shape)
+    
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the decode process pool, or None where child processes are not allowed"""
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(settings.VIDEO_DECODE_WORKERS, _init_worker)
+        return self._process_pool
+    
+    def shutdown(self) -> None:
+        """Stop the decode worker processes"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+    
+    def _extract_frames_and_metadata(self, video_path: Path) -> Tuple[Dict[str, Any], np.ndarray]:
+        """Open the video once, returning its metadata and the sampled grayscale frames"""
+        # Open video file, decoding on the GPU when the OpenCV build supports it
+        params = list(CAPTURE_PARAMS)
+        if self.decode_threads:
+            params += [cv2.CAP_PROP_N_THREADS, self.decode_threads]
         
-        # Open video file
-        cap = cv2.VideoCapture(str(video_path))
+        cap = None
+        if params:
+            cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, params)
+        if cap is None or not cap.isOpened():
+            cap = cv2.VideoCapture(str(video_path))
         
         if not cap.isOpened():
             raise Exception(f"Could not open video file: {video_path}")
@@ -60,35 +228,18 @@ class VideoProcessor:
             # Extract video metadata
             metadata = self._extract_metadata(cap)
             
-            # Extract frames for emotion analysis
-            frames = self._extract_frames(cap, max_frames=30)
-            
-            # Reset video capture for audio extraction
-            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            # Extract grayscale frames for emotion analysis, reusing the properties read above
+            frames_gray = self._extract_frames(cap, video_path, metadata, max_frames=30)
             
-            # Extract audio (mock implementation - would use ffmpeg in production)
-            audio_data = self._extract_audio_mock(video_path)
-            
-            # Generate mock transcript (would use speech-to-text service)
-            transcript = self._generate_mock_transcript()
-            
-            return {
-                "metadata": metadata,
-                "frames": frames,
-                "audio": audio_data,
-                "transcript": transcript,
-                "timestamp": datetime.now().isoformat()
-            }
+            return metadata, frames_gray
             
         finally:
             cap.release()
     
     def _extract_metadata(self, cap) -> Dict[str, Any]:
         """Extract video metadata"""
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps, frame_count, width, height = [cap.get(prop) for prop in METADATA_PROPS]
+        frame_count, width, height = int(frame_count), int(width), int(height)
         duration = frame_count / fps if fps > 0 else 0
         
         return {
@@ -100,59 +251,155 @@ class VideoProcessor:
             "resolution": f"{width}x{height}"
         }
     
-    def _extract_frames(self, cap, max_frames: int = 30) -> List[np.ndarray]:
-        """Extract representative frames from video"""
-        frames = []
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    def _extract_frames(
+        self,
+        cap,
+        video_path: Path,
+        metadata: Dict[str, Any],
+        max_frames: int = 30,
+        target_size: Optional[Tuple[int, int]] = None
+    ) -> np.ndarray:
+        """
+        Extract representative frames from video as an (N, H, W) uint8 grayscale array
         
-        if frame_count == 0:
-            return frames
+        The uint8 dtype is part of the contract: frames are never promoted to float here, and
+        consumers should not upcast the whole batch (float32 is 4x the bytes). Models that need
+        float input normalize per batch inside their wrapper, preferably as float16.
+        
+        Args:
+            cap: Open capture, used for the OpenCV fallback
+            video_path: Path to the video file
+            metadata: Properties from _extract_metadata, so the capture is not queried again
+            max_frames: Maximum number of frames to sample, one per evenly spaced window
+            target_size: Optional (width, height) each frame is resized to as it is decoded;
+                frames keep the video resolution when None
+        """
+        frame_count = metadata["frame_count"]
+        
+        if target_size is None:
+            target_size = (metadata["width"], metadata["height"])
         
         # Calculate frame intervals to get evenly distributed frames
         interval = max(1, frame_count // max_frames)
+        targets = range(0, frame_count, interval)[:max_frames]
+        
+        # Frames are decoded straight into one contiguous buffer, returned as a view of the filled part
+        frames = np.empty((len(targets), target_size[1], target_size[0]), dtype=FRAME_DTYPE)
+        if not targets:
+            return frames
+        
+        try:
+            count = self._read_frames_av(video_path, targets, target_size, frames)
+        except (av.error.FFmpegError, IndexError) as e:
+            logger.warning(f"PyAV decode failed for {video_path}, falling back to OpenCV: {str(e)}")
+            count = self._read_frames_cv2(cap, targets, target_size, frames)
+        
+        return frames[:count]
+    
+    def _read_frames_av(
+        self, video_path: Path, targets: range, target_size: Tuple[int, int], out: np.ndarray
+    ) -> int:
+        """
+        Decode the video once with PyAV, writing one grayscale frame per sampling window into out
+        
+        Each window starts at a target index and spans one interval. The frame that differs most
+        from its predecessor is kept, so samples favour scene changes and motion over static
+        frames; for static footage this is the first frame of each window, as with even sampling.
+        
+        Returns:
+            Number of frames written
+        """
+        step = targets.step
+        end = targets[-1] + step
         
-        frame_idx = 0
-        while len(frames) < max_frames and frame_idx < frame_count:
+        # libswscale converts straight to 8-bit luma at the buffer's size, no BGR intermediate
+        reformat = {"format": "gray", "width": target_size[0], "height": target_size[1], "interpolation": "AREA"}
+        thumb_width, thumb_height = SCORE_THUMBNAIL_SIZE
+        
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            if self.decode_threads:
+                stream.thread_count = self.decode_threads
+            
+            window = -1
+            best_score = -1.0
+            prev_thumb = None
+            for index, frame in enumerate(container.decode(stream)):
+                if index >= end:
+                    break
+                
+                if index // step != window:
+                    window = index // step
+                    best_score = -1.0
+                
+                thumb = frame.to_ndarray(format="gray", width=thumb_width, height=thumb_height)
+                score = _frame_difference(prev_thumb, thumb) if prev_thumb is not None else 0.0
+                prev_thumb = thumb
+                
+                # Only frames that beat the window's current best pay for the full-size conversion
+                if score > best_score:
+                    best_score = score
+                    out[window] = frame.to_ndarray(**reformat)
+        
+        return window + 1
+    
+    def _read_frames_cv2(
+        self, cap, targets: range, target_size: Tuple[int, int], out: np.ndarray
+    ) -> int:
+        """Read the target frames with OpenCV into out as grayscale, returning how many were written"""
+        # Each seek re-decodes from the previous keyframe, so only seek for very sparse samples
+        if targets.step > KEYFRAME_GAP:
+            return self._seek_frames_cv2(cap, targets, target_size, out)
+        
+        count = 0
+        wanted = set(targets)
+        for frame_idx in range(targets[-1] + 1):
+            if frame_idx in wanted:
+                ret, frame = cap.read()
+                if ret:
+                    self._to_gray(frame, target_size, out[count])
+                    count += 1
+            else:
+                # grab() advances without converting the skipped frame to BGR
+                ret = cap.grab()
+            
+            if not ret:
+                break
+        
+        return count
+    
+    def _seek_frames_cv2(
+        self, cap, targets: range, target_size: Tuple[int, int], out: np.ndarray
+    ) -> int:
+        """Read the target frames with OpenCV into out, seeking to each one"""
+        count = 0
+        for frame_idx in targets:
             cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
             ret, frame = cap.read()
             
             if ret:
-                # Convert BGR to RGB for further processing
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(frame_rgb)
-            
-            frame_idx += interval
+                self._to_gray(frame, target_size, out[count])
+                count += 1
         
-        return frames
+        return count
     
-    def _extract_audio_mock(self, video_path: Path) -> Dict[str, Any]:
-        """Mock audio extraction - in production would use ffmpeg"""
-        return {
-            "sample_rate": 44100,
-            "duration": 30.5,
-            "channels": 2,
-            "format": "wav",
-            "audio_file_path": None,  # Would contain path to extracted audio
-            "volume_analysis": {
-                "average_volume": 0.65,
-                "peak_volume": 0.89,
-                "silence_periods": [{"start": 2.3, "end": 3.1}]
-            }
-        }
+    def _to_gray(self, frame: np.ndarray, target_size: Tuple[int, int], dst: np.ndarray) -> None:
+        """Convert a decoded BGR frame to grayscale into dst, resizing it when its size differs"""
+        # Face detection only needs luma; OpenCV decodes to BGR
+        if frame.shape[1::-1] == target_size:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+        else:
+            cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), target_size, dst=dst, interpolation=cv2.INTER_AREA)
+    
+    def _extract_audio_mock(self, video_path: Path, work_dir: Path) -> Mapping[str, Any]:
+        """Mock audio extraction - in production would use ffmpeg, with its own demuxer, writing into work_dir"""
+        return _MOCK_AUDIO
+    
+    async def _transcribe(self, video_path: Path) -> str:
+        """Transcribe the video's speech (mock implementation - would await Whisper or similar)"""
+        return self._generate_mock_transcript()
     
     def _generate_mock_transcript(self) -> str:
         """Mock transcript generation - in production would use Whisper or similar"""
-        return """Hello, I'm excited to present our new product to you today. 
-        This solution can help your company increase efficiency by up to 40%. 
-        Let me walk you through the key features and benefits. 
-        As you can see from this demonstration, the interface is intuitive and user-friendly. 
-        I believe this would be a perfect fit for your organization's needs."""
-    
-    async def cleanup_temp_files(self):
-        """Clean up temporary files created during processing"""
-        try:
-            for file_path in self.temp_dir.glob("*"):
-                if file_path.is_file():
-                    file_path.unlink()
-        except Exception as e:
-            logger.warning(f"Error cleaning up temp files: {str(e)}") 
\ No newline at end of file
+        return _MOCK_TRANSCRIPT
\ No newline at end of file
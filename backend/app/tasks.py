@@ -1,5 +1,29 @@
 from celery import Task
 from app.celery_app import celery_app
+from app.services.video_processor import VideoProcessor
+from app.services.emotion_detector import EmotionDetector
+from app.services.speech_analyzer import SpeechAnalyzer
+from app.services.text_analyzer import TextAnalyzer
+from app.services.analysis_pipeline import run_video_analysis, format_analysis_result
+from app.agents.coaching_agent import CoachingAgent
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import asyncio
+
+# Analysis services are built once per worker process and reused by every task
+_services = None
+
+def get_services() -> Tuple[VideoProcessor, EmotionDetector, SpeechAnalyzer, TextAnalyzer, CoachingAgent]:
+    global _services
+    if _services is None:
+        _services = (
+            VideoProcessor(),
+            EmotionDetector(),
+            SpeechAnalyzer(),
+            TextAnalyzer(),
+            CoachingAgent()
+        )
+    return _services
 
 class CallbackTask(Task):
     def on_success(self, retval, task_id, args, kwargs):
@@ -34,4 +58,43 @@ def analyze_speech(self, audio_data):
         # This would contain actual speech analysis logic
         return {"speech": {"clarity": 0.85, "pace": "normal"}}
     except Exception as exc:
-        self.retry(exc=exc, countdown=60, max_retries=3) 
\ No newline at end of file
+        self.retry(exc=exc, countdown=60, max_retries=3)
+
+async def _process_video_full(video_path: str) -> Dict[str, Any]:
+    """Decode the video once and analyze its frames and audio in this worker"""
+    video_processor, emotion_detector, speech_analyzer, _, _ = get_services()
+    video_data = await video_processor.process_video(video_path)
+    
+    emotions, speech = await asyncio.gather(
+        emotion_detector.analyze_emotions(video_data["frames_gray"]),
+        speech_analyzer.analyze_speech(video_data["audio"])
+    )
+    
+    # Frames stay in this process; only the JSON-sized results go to the result backend
+    return {
+        "status": "completed",
+        "video_path": video_path,
+        "metadata": video_data["metadata"],
+        "emotions": emotions,
+        "speech": speech,
+        "transcript": video_data["transcript"],
+        "timestamp": video_data["timestamp"]
+    }
+
+@celery_app.task(base=CallbackTask)
+def process_video_full(video_path: str):
+    """Process a video and run emotion and speech analysis on one decode"""
+    return asyncio.run(_process_video_full(video_path))
+
+@celery_app.task(bind=True, base=CallbackTask)
+def analyze_video_file(self, file_path: str, file_id: str, filename: str):
+    """Run the full analysis pipeline for an uploaded video"""
+    try:
+        analysis_data, coaching_recommendations, video_data = asyncio.run(
+            run_video_analysis(file_id, file_path, *get_services())
+        )
+        result = format_analysis_result(analysis_data, coaching_recommendations, video_data)
+        return {"id": file_id, "filename": filename, **result}
+    finally:
+        # The upload is only needed for this analysis
+        Path(file_path).unlink(missing_ok=True) 
\ No newline at end of file
@@ -1,54 +1,94 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
 import os
 from pathlib import Path
-import shutil
 from datetime import datetime
 import logging
+import json
+import time
+from functools import lru_cache
+from contextlib import asynccontextmanager
 
 from app.api.routes import router as api_router
 from app.core.config import settings
+from app.core.cache import LRUCache
+from app.services.video_processor import VideoProcessor
+from app.services.emotion_detector import EmotionDetector
+from app.services.speech_analyzer import SpeechAnalyzer
+from app.services.text_analyzer import TextAnalyzer
+from app.agents.coaching_agent import CoachingAgent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the analysis services once and share them across requests
+    app.state.video_processor = VideoProcessor()
+    app.state.emotion_detector = EmotionDetector()
+    app.state.speech_analyzer = SpeechAnalyzer()
+    app.state.text_analyzer = TextAnalyzer()
+    app.state.coaching_agent = CoachingAgent()
+    app.state.analysis_cache = LRUCache(maxsize=settings.ANALYSIS_CACHE_SIZE)
+    yield
+    
+    # Release worker threads and processes owned by the services
+    app.state.video_processor.shutdown()
+    app.state.emotion_detector.shutdown()
+    app.state.text_analyzer.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="AI Video Sales Coach",
     description="Multimodal AI coaching system for sales training",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Configure CORS
+# Compress larger JSON responses; level 1 keeps most of the ratio for a fraction of the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
+# Configure CORS - added last so it runs first and answers preflights before compression
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify allowed origins
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight results for a day
 )
 
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
+@lru_cache(maxsize=1)
+def _iso_timestamp(second: int) -> str:
+    """ISO timestamp for a Unix second, rebuilt at most once per second"""
+    return datetime.fromtimestamp(second).isoformat()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": _iso_timestamp(int(time.time()))}
+
+# The root response never changes, so it is serialized once at import
+_ROOT_JSON = json.dumps({
+    "message": "AI Video Sales Coach API",
+    "version": "1.0.0",
+    "docs": "/docs"
+}).encode()
 
 # Root endpoint
 @app.get("/")
 async def root():
-    return {
-        "message": "AI Video Sales Coach API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     uvicorn.run(
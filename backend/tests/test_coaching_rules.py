@@ -0,0 +1,167 @@
+import asyncio
+import random
+import unittest
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.agents.coaching_agent import (
+    CoachingAgent,
+    _RULE_INPUTS,
+    _RULE_SECTIONS,
+    _RULE_TEMPLATE_IDS,
+    _eval_rules,
+    _rule_key,
+    _triggered_template_ids,
+)
+
+# Offsets tried around every rule threshold, including ones that rounding to 3 decimals would move across it
+OFFSETS = (-1e-3, -3.2e-4, -1e-9, 0.0, 1e-9, 3.2e-4, 1e-3)
+
+def _session(
+    engagement: float = 0.8,
+    stability: float = 0.9,
+    rate: float = 135.0,
+    fillers: int = 1,
+    confidence: float = 0.8,
+    persuasion: float = 0.8,
+    professionalism: float = 0.8,
+    clarity: float = 0.8,
+    dominant: str = "neutral",
+    sentiment: str = "neutral"
+) -> Dict[str, Any]:
+    """Analysis results for one session in the shape the pipeline produces"""
+    return {
+        "emotions": {
+            "dominant_emotion": dominant,
+            "analysis_summary": {"engagement_level": engagement, "emotion_stability": stability},
+        },
+        "speech": {
+            "speaking_rate": rate,
+            "filler_total": fillers,
+            "delivery_metrics": {"confidence_score": confidence},
+        },
+        "text": {
+            "persuasiveness_score": persuasion,
+            "professionalism_score": professionalism,
+            "clarity_score": clarity,
+            "sentiment": sentiment,
+        },
+    }
+
+def _threshold_sessions() -> List[Dict[str, Any]]:
+    """Sessions with one score at a time placed just around each of its thresholds"""
+    thresholds = {
+        "engagement": (0.5, 0.6),
+        "stability": (0.7,),
+        "rate": (0.0, 120.0, 150.0),
+        "fillers": (3,),
+        "confidence": (0.7,),
+        "persuasion": (0.6,),
+        "professionalism": (0.7,),
+        "clarity": (0.6,),
+    }
+    sessions = []
+    for field, values in thresholds.items():
+        for threshold in values:
+            for offset in OFFSETS:
+                value = threshold + offset if field != "fillers" else threshold + round(offset * 1e3)
+                sessions.append(_session(**{field: value}))
+    
+    # Overall confidence is the mean of three scores, so move all three together
+    for offset in OFFSETS:
+        value = 0.6 + offset
+        sessions.append(_session(engagement=value, confidence=value, persuasion=value))
+    
+    # Reported regressions: each dropped a recommendation through key rounding
+    sessions.append(_session(rate=119.993))
+    sessions.append(_session(confidence=0.69968))
+    sessions.append(_session(engagement=0.59976, confidence=0.59976, persuasion=0.59976))
+    return sessions
+
+def _random_sessions(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Sessions with scores drawn close to the rule thresholds, some missing a modality"""
+    rng = random.Random(seed)
+    
+    def near(*thresholds: float) -> float:
+        return rng.choice(thresholds) + rng.uniform(-2e-3, 2e-3)
+    
+    sessions = []
+    for _ in range(count):
+        session = _session(
+            engagement=near(0.5, 0.6),
+            stability=near(0.7),
+            rate=near(0.0, 120.0, 150.0) if rng.random() < 0.9 else 0,
+            fillers=rng.randint(0, 6),
+            confidence=near(0.7),
+            persuasion=near(0.6),
+            professionalism=near(0.7),
+            clarity=near(0.6),
+            dominant=rng.choice(("neutral", "happy", "sad", "fear")),
+            sentiment=rng.choice(("neutral", "positive", "negative"))
+        )
+        for modality in ("emotions", "speech", "text"):
+            if rng.random() < 0.15:
+                del session[modality]
+        sessions.append(session)
+    return sessions
+
+def _baseline_ids(context: Dict[str, Any]) -> Tuple[str, ...]:
+    """Evaluate the rule tables directly on the exact context, without memoisation"""
+    return tuple(
+        template_id
+        for section, rules in _RULE_SECTIONS
+        if section is None or context[section]
+        for template_id, predicate in rules
+        if predicate(context)
+    )
+
+def _batch_ids(contexts: List[Dict[str, Any]]) -> List[Tuple[str, ...]]:
+    """Evaluate the rules for every context through the compiled batch kernel"""
+    features = np.array(
+        [[float(context[name]) for name in _RULE_INPUTS] for context in contexts],
+        dtype=np.float64
+    )
+    return [tuple(_RULE_TEMPLATE_IDS[rule] for rule in np.flatnonzero(row)) for row in _eval_rules(features)]
+
+class RuleParityTest(unittest.TestCase):
+    """The memoised single path, the batch kernel and direct evaluation must agree"""
+    
+    def assert_parity(self, sessions: List[Dict[str, Any]]) -> None:
+        contexts = [CoachingAgent._build_context(session) for session in sessions]
+        batch = _batch_ids(contexts)
+        for context, batch_ids in zip(contexts, batch):
+            baseline = _baseline_ids(context)
+            with self.subTest(context=context):
+                self.assertEqual(_triggered_template_ids(_rule_key(context)), baseline)
+                self.assertEqual(batch_ids, baseline)
+    
+    def test_parity_near_thresholds(self):
+        self.assert_parity(_threshold_sessions())
+    
+    def test_parity_on_random_sessions(self):
+        self.assert_parity([session for session in _random_sessions(2000) if any(session.values())])
+    
+    def test_reported_regressions_fire(self):
+        cases = (
+            (_session(rate=119.993), "SPEECH_TOO_SLOW"),
+            (_session(confidence=0.69968), "SPEECH_LOW_CONFIDENCE"),
+            (_session(engagement=0.59976, confidence=0.59976, persuasion=0.59976), "HOLISTIC_LOW_CONFIDENCE"),
+        )
+        for session, template_id in cases:
+            with self.subTest(template_id=template_id):
+                context = CoachingAgent._build_context(session)
+                self.assertIn(template_id, _triggered_template_ids(_rule_key(context)))
+    
+    def test_single_and_batch_recommendations_match(self):
+        agent = CoachingAgent()
+        sessions = _threshold_sessions() + _random_sessions(300, seed=1) + [{}]
+        
+        batch = asyncio.run(agent.generate_recommendations_batch(sessions))
+        for session, batch_recommendations in zip(sessions, batch):
+            single = asyncio.run(agent.generate_recommendations(session))
+            with self.subTest(session=session):
+                self.assertEqual(single, batch_recommendations)
+
+if __name__ == "__main__":
+    unittest.main()